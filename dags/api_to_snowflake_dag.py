@@ -14,12 +14,19 @@ Schedule: Hourly (configurable)
 import json
 import logging
 from datetime import datetime, timedelta
-from typing import Any
+from typing import Any, Optional
 
 from airflow import DAG
-from airflow.operators.python import PythonOperator
-from airflow.providers.snowflake.operators.snowflake import SnowflakeOperator
+from airflow.decorators import task
 from airflow.operators.empty import EmptyOperator
+from airflow.providers.common.sql.operators.sql import SQLExecuteQueryOperator
+from airflow.providers.common.sql.sensors.sql import SqlSensor
+
+# The deferrable SQL API operator (CLEAN/ANALYTICS tasks) is the one
+# Snowflake-specific class this DAG needs. Its module loads the Snowflake
+# connector, so every DagBag parse of this file pays that import cost; the
+# other SQL tasks use the common.sql operator, whose hook loads at run time.
+from airflow.providers.snowflake.operators.snowflake import SnowflakeSqlApiOperator
 from airflow.utils.trigger_rule import TriggerRule
 
 logger = logging.getLogger(__name__)
@@ -31,6 +38,22 @@ logger = logging.getLogger(__name__)
 SNOWFLAKE_CONN_ID = "snowflake_default"
 DAG_ID = "api_to_snowflake_pipeline"
 
+# Pool bounding concurrent tasks that run on PIPELINE_WH (created in airflow-init)
+SNOWFLAKE_POOL = "snowflake_warehouse"
+
+# Sources ingested in parallel; each has a 1-slot pool so concurrent DAG runs
+# never contend for the same API rate limit (pools created in airflow-init).
+# One slot, not rate_limit_requests: each task already paces a whole extract
+# to the client's full per-minute budget.
+INGEST_SOURCES = ["api_a", "api_b"]
+
+# Snowpipe load polling (sensors release their worker slot between pokes)
+PIPE_POKE_INTERVAL_SECONDS = 10
+PIPE_LOAD_TIMEOUT = timedelta(minutes=30)
+
+# Deferred SQL API tasks hand off to the triggerer, which polls the statement
+SQL_API_POLL_INTERVAL_SECONDS = 10
+
 default_args = {
     "owner": "data-engineering",
     "depends_on_past": False,
@@ -91,12 +114,56 @@ def on_success_callback(context: dict[str, Any]) -> None:
     )
 
 
+# ============================================
+# Snowflake Connection
+# ============================================
+
+# conn_id -> connection opened by this worker process. A handful of conn_ids
+# at most, so entries are only ever replaced, never evicted.
+_SNOWFLAKE_CONNS: dict[str, Any] = {}
+
+
+def get_snowflake_conn(conn_id: str = SNOWFLAKE_CONN_ID):
+    """Get a live Snowflake connection, reusing one cached in this process.
+    
+    Tasks running in the same worker process share the connection instead
+    of re-authenticating. A connection that has been closed (e.g. session
+    expired) is replaced; connections for other conn_ids are left alone.
+    
+    Args:
+        conn_id: Airflow connection ID
+        
+    Returns:
+        snowflake.connector.SnowflakeConnection
+    """
+    conn = _SNOWFLAKE_CONNS.get(conn_id)
+    if conn is None or conn.is_closed():
+        from airflow.providers.snowflake.hooks.snowflake import SnowflakeHook
+        
+        conn = _SNOWFLAKE_CONNS[conn_id] = SnowflakeHook(snowflake_conn_id=conn_id).get_conn()
+    return conn
+
+
 # ============================================
 # Task Functions
 # ============================================
 
-def ingest_api_data_to_s3(**context) -> dict:
-    """Ingest data from all APIs and upload to S3.
+@task(
+    on_failure_callback=on_failure_callback,
+    on_success_callback=on_success_callback,
+)
+def ingest_api_data_to_s3(
+    source: str,
+    prev_execution_date=None,
+) -> dict:
+    """Ingest data from one API and upload to S3.
+    
+    Records go to S3 directly; only this small result dict is returned as
+    an XCom, which merge_ingestion_results combines for downstream tasks.
+    
+    Args:
+        source: Source to ingest ("api_a" or "api_b")
+        prev_execution_date: Injected from the Airflow context (None on first run)
     
     Returns:
         dict: Ingestion results with batch_id and record counts
@@ -108,21 +175,20 @@ def ingest_api_data_to_s3(**context) -> dict:
     
     # Get incremental timestamp from previous run if available
     since = None
-    prev_run = context.get("prev_execution_date")
-    if prev_run:
-        since = prev_run.isoformat()
+    if prev_execution_date:
+        since = prev_execution_date.isoformat()
         logger.info(f"Running incremental load since {since}")
     
-    # Run ingestion for all sources
+    # Gzipped JSONL: ff_jsonl auto-detects the compression, so the pipes
+    # load it unchanged while uploads shrink several-fold. No batch_id is
+    # passed, so each try stages under a fresh random one and a retry never
+    # overwrites files Snowpipe may already have loaded.
     result = run_ingestion(
-        sources=["api_a", "api_b"],
+        sources=[source],
         since=since,
+        file_format="jsonl.gz",
     )
     
-    # Push results to XCom for downstream tasks
-    context["ti"].xcom_push(key="ingestion_result", value=result)
-    context["ti"].xcom_push(key="batch_id", value=result["batch_id"])
-    
     logger.info(
         f"Ingestion complete: {result['total_records_staged']} records staged",
         extra=result
@@ -135,10 +201,73 @@ def ingest_api_data_to_s3(**context) -> dict:
     return result
 
 
-def run_data_quality_checks(**context) -> dict:
+@task(task_id="merge_ingestion_results")
+def merge_ingestion_results(results: list[dict]) -> dict:
+    """Combine per-source ingestion results into one run summary.
+    
+    Args:
+        results: Return values of the per-source ingest tasks
+        
+    Returns:
+        dict: Summary in the same shape as run_ingestion's return value
+    """
+    return {
+        # One batch ID per source task (see ingest_api_data_to_s3)
+        "batch_id": ",".join(r["batch_id"] for r in results),
+        "status": "success",
+        "sources": [source for r in results for source in r["sources"]],
+        "total_records_fetched": sum(r["total_records_fetched"] for r in results),
+        "total_records_staged": sum(r["total_records_staged"] for r in results),
+        # Sources ran in parallel, so the run took as long as the slowest
+        "duration_seconds": max(r["duration_seconds"] for r in results),
+        "started_at": min(r["started_at"] for r in results),
+        "completed_at": max(r["completed_at"] for r in results),
+        "results": {k: v for r in results for k, v in r["results"].items()},
+    }
+
+
+DQ_RESULT_COLUMNS = (
+    "check_name", "check_type", "table_name", "result_value",
+    "threshold_value", "passed", "error_message", "executed_at",
+)
+
+
+def _fetch_dq_rows() -> list[dict]:
+    """Fetch the most recent DQ_CHECK_RESULTS rows in one round-trip.
+    
+    Returns:
+        list: One dict per result row, keyed by DQ_RESULT_COLUMNS
+    """
+    # Same connection (and keep-alive settings) as the SQL operator tasks,
+    # cached per worker process; only the cursor is closed here
+    conn = get_snowflake_conn(SNOWFLAKE_CONN_ID)
+    
+    with conn.cursor() as cursor:
+        # Get results from most recent DQ run (last 5 minutes)
+        cursor.execute(f"""
+            SELECT {", ".join(DQ_RESULT_COLUMNS)}
+            FROM ANALYTICS.DQ_CHECK_RESULTS
+            WHERE executed_at >= DATEADD(MINUTE, -5, CURRENT_TIMESTAMP())
+            ORDER BY executed_at DESC
+        """)
+        # Arrow result chunks decode in C++; None when no rows matched
+        table = cursor.fetch_arrow_all()
+    
+    if table is None:
+        return []
+    return table.rename_columns(list(DQ_RESULT_COLUMNS)).to_pylist()
+
+
+@task(
+    task_id="validate_dq_results",
+    pool=SNOWFLAKE_POOL,
+    on_failure_callback=on_failure_callback,
+)
+def run_data_quality_checks() -> dict:
     """Validate data quality check results from DQ_CHECK_RESULTS table.
     
     Reads results inserted by the SQL DQ checks and determines pass/fail.
+    The returned dict is passed to publish_pipeline_metrics as a TaskFlow XCom.
     
     Checks validated:
     - Row count > 0 for each CLEAN table
@@ -149,78 +278,30 @@ def run_data_quality_checks(**context) -> dict:
     Returns:
         dict: DQ check results
     """
-    import snowflake.connector
-    import os
-    
-    conn = snowflake.connector.connect(
-        account=os.getenv("SNOWFLAKE_ACCOUNT"),
-        user=os.getenv("SNOWFLAKE_USER"),
-        password=os.getenv("SNOWFLAKE_PASSWORD"),
-        warehouse=os.getenv("SNOWFLAKE_WAREHOUSE", "PIPELINE_WH"),
-        database=os.getenv("SNOWFLAKE_DATABASE", "VIDEO_ANALYTICS"),
-    )
+    rows = _fetch_dq_rows()
     
-    cursor = conn.cursor()
+    # Stringify executed_at for XCom/log serialization
+    checks = [{**row, "executed_at": str(row["executed_at"])} for row in rows]
     
-    try:
-        # Get results from most recent DQ run (last 5 minutes)
-        cursor.execute("""
-            SELECT 
-                check_name,
-                check_type,
-                table_name,
-                result_value,
-                threshold_value,
-                passed,
-                error_message,
-                executed_at
-            FROM ANALYTICS.DQ_CHECK_RESULTS
-            WHERE executed_at >= DATEADD(MINUTE, -5, CURRENT_TIMESTAMP())
-            ORDER BY executed_at DESC
-        """)
-        
-        results = cursor.fetchall()
-        columns = ["check_name", "check_type", "table_name", "result_value", 
-                   "threshold_value", "passed", "error_message", "executed_at"]
-        
-        checks = []
-        for row in results:
-            check = dict(zip(columns, row))
-            check["executed_at"] = str(check["executed_at"])
-            checks.append(check)
-            
-            status = "✓ PASSED" if check["passed"] else "✗ FAILED"
-            logger.info(
-                f"DQ Check: {check['check_name']} on {check['table_name']} - {status}",
-                extra=check
-            )
-        
-        # Get summary
-        cursor.execute("""
-            SELECT
-                COUNT(*) AS total_checks,
-                SUM(CASE WHEN passed THEN 1 ELSE 0 END) AS passed_checks,
-                SUM(CASE WHEN NOT passed THEN 1 ELSE 0 END) AS failed_checks
-            FROM ANALYTICS.DQ_CHECK_RESULTS
-            WHERE executed_at >= DATEADD(MINUTE, -5, CURRENT_TIMESTAMP())
-        """)
-        
-        summary = cursor.fetchone()
-        total, passed, failed = summary
-        
-    finally:
-        cursor.close()
-        conn.close()
+    # Summarize from the fetched rows rather than a second round-trip
+    # (NULL results count as neither passed nor failed, as in SQL)
+    total = len(checks)
+    passed = sum(1 for c in checks if c["passed"] is True)
+    failed = sum(1 for c in checks if c["passed"] is False)
+    
+    # One structured record for the whole run instead of one log line per check
+    logger.info(
+        f"DQ results: {passed}/{total} checks passed",
+        extra={"checks": checks, "passed": passed, "failed": failed},
+    )
     
     result = {
-        "total_checks": total or 0,
-        "passed": passed or 0,
-        "failed": failed or 0,
+        "total_checks": total,
+        "passed": passed,
+        "failed": failed,
         "checks": checks,
     }
     
-    context["ti"].xcom_push(key="dq_results", value=result)
-    
     if failed and failed > 0:
         # Get failed checks for error message
         failed_checks = [c for c in checks if not c["passed"]]
@@ -245,38 +326,52 @@ def run_data_quality_checks(**context) -> dict:
     return result
 
 
-def publish_pipeline_metrics(**context) -> dict:
+@task(
+    task_id="publish_metrics",
+    trigger_rule=TriggerRule.ALL_DONE,  # Run even if DQ checks fail
+    on_success_callback=on_success_callback,
+)
+def publish_pipeline_metrics(
+    ingestion_result: Optional[dict],
+    dq_results: Optional[dict],
+    dag=None,
+    run_id: Optional[str] = None,
+    execution_date=None,
+) -> dict:
     """Publish pipeline metrics for monitoring.
     
     Collects and logs metrics from the pipeline run.
     
+    Args:
+        ingestion_result: Return value of merge_ingestion_results
+        dq_results: Return value of the DQ validator (None if it failed)
+        dag, run_id, execution_date: Injected from the Airflow context
+    
     Returns:
         dict: Pipeline metrics
     """
-    # Get results from previous tasks
-    ti = context["ti"]
-    ingestion_result = ti.xcom_pull(key="ingestion_result", task_ids="ingest_api_data_to_s3")
-    dq_results = ti.xcom_pull(key="dq_results", task_ids="run_dq_checks")
+    ingestion_result = ingestion_result or {}
+    dq_results = dq_results or {}
     
     metrics = {
-        "dag_id": context["dag"].dag_id,
-        "run_id": context["run_id"],
-        "execution_date": str(context["execution_date"]),
+        "dag_id": dag.dag_id,
+        "run_id": run_id,
+        "execution_date": str(execution_date),
         "ingestion": {
-            "batch_id": ingestion_result.get("batch_id") if ingestion_result else None,
-            "records_fetched": ingestion_result.get("total_records_fetched", 0) if ingestion_result else 0,
-            "records_staged": ingestion_result.get("total_records_staged", 0) if ingestion_result else 0,
-            "duration_seconds": ingestion_result.get("duration_seconds", 0) if ingestion_result else 0,
+            "batch_id": ingestion_result.get("batch_id"),
+            "records_fetched": ingestion_result.get("total_records_fetched", 0),
+            "records_staged": ingestion_result.get("total_records_staged", 0),
+            "duration_seconds": ingestion_result.get("duration_seconds", 0),
         },
         "data_quality": {
-            "total_checks": dq_results.get("total_checks", 0) if dq_results else 0,
-            "passed": dq_results.get("passed", 0) if dq_results else 0,
-            "failed": dq_results.get("failed", 0) if dq_results else 0,
+            "total_checks": dq_results.get("total_checks", 0),
+            "passed": dq_results.get("passed", 0),
+            "failed": dq_results.get("failed", 0),
         },
         "status": "success",
     }
     
-    logger.info(f"Pipeline metrics: {json.dumps(metrics, indent=2)}")
+    logger.info("Pipeline metrics published", extra=metrics)
     
     # TODO: Push to metrics system (Datadog, CloudWatch, etc.)
     # Example:
@@ -307,65 +402,100 @@ with DAG(
     start = EmptyOperator(task_id="start")
     
     # ========================================
-    # Task 1: Ingest API Data to S3
+    # Task 1: Ingest API Data to S3 (one task per source, in parallel)
+    # ========================================
+    ingest_results = [
+        ingest_api_data_to_s3.override(
+            task_id=f"ingest_{source}_to_s3",
+            pool=source,
+        )(source=source)
+        for source in INGEST_SOURCES
+    ]
+    
+    ingestion_result = merge_ingestion_results(ingest_results)
+    
     # ========================================
-    ingest_task = PythonOperator(
-        task_id="ingest_api_data_to_s3",
-        python_callable=ingest_api_data_to_s3,
+    # Task 2: Refresh Snowpipes
+    # ========================================
+    # Both refreshes in one task/session: saves a scheduling round-trip
+    refresh_pipes = SQLExecuteQueryOperator(
+        task_id="refresh_snowpipes",
+        conn_id=SNOWFLAKE_CONN_ID,
+        pool=SNOWFLAKE_POOL,
+        sql=[
+            "USE DATABASE VIDEO_ANALYTICS",
+            "USE SCHEMA RAW",
+            "ALTER PIPE pipe_api_a REFRESH",
+            "ALTER PIPE pipe_api_b REFRESH",
+        ],
         on_failure_callback=on_failure_callback,
-        on_success_callback=on_success_callback,
     )
     
     # ========================================
-    # Task 2: Refresh Snowpipes
+    # Task 3: Wait for Snowpipe (poll pipe status)
     # ========================================
-    refresh_pipe_api_a = SnowflakeOperator(
-        task_id="refresh_snowpipe_api_a",
-        snowflake_conn_id=SNOWFLAKE_CONN_ID,
+    # Succeeds once the pipe has no files left in its load queue.
+    # Reschedule mode frees the worker slot between pokes.
+    wait_for_pipe_api_a = SqlSensor(
+        task_id="wait_for_snowpipe_api_a",
+        conn_id=SNOWFLAKE_CONN_ID,
+        pool=SNOWFLAKE_POOL,
         sql="""
-            USE DATABASE VIDEO_ANALYTICS;
-            USE SCHEMA RAW;
-            ALTER PIPE pipe_api_a REFRESH;
+            SELECT PARSE_JSON(
+                SYSTEM$PIPE_STATUS('VIDEO_ANALYTICS.RAW.pipe_api_a')
+            ):pendingFileCount::INT = 0
         """,
+        mode="reschedule",
+        poke_interval=PIPE_POKE_INTERVAL_SECONDS,
+        timeout=PIPE_LOAD_TIMEOUT.total_seconds(),
         on_failure_callback=on_failure_callback,
     )
     
-    refresh_pipe_api_b = SnowflakeOperator(
-        task_id="refresh_snowpipe_api_b",
-        snowflake_conn_id=SNOWFLAKE_CONN_ID,
+    wait_for_pipe_api_b = SqlSensor(
+        task_id="wait_for_snowpipe_api_b",
+        conn_id=SNOWFLAKE_CONN_ID,
+        pool=SNOWFLAKE_POOL,
         sql="""
-            USE DATABASE VIDEO_ANALYTICS;
-            USE SCHEMA RAW;
-            ALTER PIPE pipe_api_b REFRESH;
+            SELECT PARSE_JSON(
+                SYSTEM$PIPE_STATUS('VIDEO_ANALYTICS.RAW.pipe_api_b')
+            ):pendingFileCount::INT = 0
         """,
+        mode="reschedule",
+        poke_interval=PIPE_POKE_INTERVAL_SECONDS,
+        timeout=PIPE_LOAD_TIMEOUT.total_seconds(),
         on_failure_callback=on_failure_callback,
     )
     
-    # ========================================
-    # Task 3: Wait for Snowpipe (simple delay)
-    # ========================================
-    wait_for_load = PythonOperator(
-        task_id="wait_for_snowpipe_load",
-        python_callable=lambda: __import__("time").sleep(30),
-        doc="Wait 30 seconds for Snowpipe to process files",
-    )
-    
     # ========================================
     # Task 4: Run CLEAN Transformations
     # ========================================
-    run_clean_sql = SnowflakeOperator(
+    # One mapped task per source so the MERGEs run on separate sessions.
+    # Deferrable: the worker slot is released while Snowflake runs the SQL.
+    run_clean_sql = SnowflakeSqlApiOperator.partial(
         task_id="run_clean_sql",
         snowflake_conn_id=SNOWFLAKE_CONN_ID,
-        sql="/opt/airflow/sql/08_clean_incremental.sql",
+        pool=SNOWFLAKE_POOL,
+        statement_count=0,
+        deferrable=True,
+        poll_interval=SQL_API_POLL_INTERVAL_SECONDS,
         on_failure_callback=on_failure_callback,
+    ).expand(
+        sql=[
+            "/opt/airflow/sql/08_clean_api_a.sql",
+            "/opt/airflow/sql/08_clean_api_b.sql",
+        ],
     )
     
     # ========================================
     # Task 5: Run ANALYTICS Transformations
     # ========================================
-    run_analytics_sql = SnowflakeOperator(
+    run_analytics_sql = SnowflakeSqlApiOperator(
         task_id="run_analytics_sql",
         snowflake_conn_id=SNOWFLAKE_CONN_ID,
+        pool=SNOWFLAKE_POOL,
+        statement_count=0,
+        deferrable=True,
+        poll_interval=SQL_API_POLL_INTERVAL_SECONDS,
         sql="""
             USE DATABASE VIDEO_ANALYTICS;
             USE WAREHOUSE PIPELINE_WH;
@@ -388,29 +518,21 @@ with DAG(
     # ========================================
     
     # Run DQ check SQL (inserts results to DQ_CHECK_RESULTS table)
-    run_dq_checks_sql = SnowflakeOperator(
+    run_dq_checks_sql = SQLExecuteQueryOperator(
         task_id="run_dq_checks_sql",
-        snowflake_conn_id=SNOWFLAKE_CONN_ID,
+        conn_id=SNOWFLAKE_CONN_ID,
+        pool=SNOWFLAKE_POOL,
         sql="/opt/airflow/sql/10_data_quality_checks.sql",
         on_failure_callback=on_failure_callback,
     )
     
     # Validate DQ results (Python check for failures)
-    dq_checks = PythonOperator(
-        task_id="validate_dq_results",
-        python_callable=run_data_quality_checks,
-        on_failure_callback=on_failure_callback,
-    )
+    dq_checks = run_data_quality_checks()
     
     # ========================================
     # Task 7: Publish Metrics
     # ========================================
-    publish_metrics = PythonOperator(
-        task_id="publish_metrics",
-        python_callable=publish_pipeline_metrics,
-        trigger_rule=TriggerRule.ALL_DONE,  # Run even if DQ checks fail
-        on_success_callback=on_success_callback,
-    )
+    publish_metrics = publish_pipeline_metrics(ingestion_result, dq_checks)
     
     # ========================================
     # End
@@ -425,14 +547,15 @@ with DAG(
     # ========================================
     
     # Ingestion first
-    start >> ingest_task
+    start >> ingest_results
     
-    # Refresh both pipes in parallel after ingestion
-    ingest_task >> [refresh_pipe_api_a, refresh_pipe_api_b]
+    # Refresh both pipes after ingestion
+    ingest_results >> refresh_pipes
     
-    # Wait for Snowpipe, then transform
-    [refresh_pipe_api_a, refresh_pipe_api_b] >> wait_for_load
-    wait_for_load >> run_clean_sql >> run_analytics_sql
+    # Wait for each pipe to drain, then transform
+    refresh_pipes >> [wait_for_pipe_api_a, wait_for_pipe_api_b]
+    [wait_for_pipe_api_a, wait_for_pipe_api_b] >> run_clean_sql
+    run_clean_sql >> run_analytics_sql
     
     # DQ checks after analytics (SQL insert → Python validation)
     run_analytics_sql >> run_dq_checks_sql >> dq_checks
@@ -440,3 +563,6 @@ with DAG(
     # Always publish metrics and end
     dq_checks >> publish_metrics >> end
 
+
+if __name__ == "__main__":
+    dag.test()
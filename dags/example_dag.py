@@ -1,6 +1,11 @@
 """Example DAG to verify Airflow setup.
 
 This DAG runs a simple task to confirm Airflow is working correctly.
+
+Convention: fan out from one upstream to many independent siblings
+(start >> [a, b, c] >> end) rather than chaining independent work; the
+scheduler builds and serializes this shape much faster, and the siblings
+run in parallel.
 """
 
 from datetime import datetime, timedelta
@@ -27,19 +32,29 @@ def print_hello():
     return "success"
 
 
-def check_imports():
-    """Verify src imports work."""
+def check_import(module: str, names: list[str]) -> str:
+    """Verify a src module and its public names import."""
+    import importlib
+    
     try:
-        from src.utils import setup_logging
-        from src.transform import transform_records
-        from src.clients import ApiAClient, ApiBClient
-        print("✓ All src imports successful!")
+        mod = importlib.import_module(module)
+        for name in names:
+            getattr(mod, name)
+        print(f"✓ {module} imports successful!")
         return "imports_ok"
-    except ImportError as e:
+    except (ImportError, AttributeError) as e:
         print(f"✗ Import error: {e}")
         raise
 
 
+# Modules checked by independent sibling tasks
+IMPORT_CHECKS = {
+    "utils": ("src.utils", ["setup_logging"]),
+    "transform": ("src.transform", ["transform_records"]),
+    "clients": ("src.clients", ["ApiAClient", "ApiBClient"]),
+}
+
+
 with DAG(
     dag_id="example_verification_dag",
     default_args=default_args,
@@ -57,12 +72,16 @@ with DAG(
         python_callable=print_hello,
     )
     
-    import_check = PythonOperator(
-        task_id="check_imports",
-        python_callable=check_imports,
-    )
+    import_checks = [
+        PythonOperator(
+            task_id=f"check_{name}_imports",
+            python_callable=check_import,
+            op_kwargs={"module": module, "names": names},
+        )
+        for name, (module, names) in IMPORT_CHECKS.items()
+    ]
     
     end = EmptyOperator(task_id="end")
     
-    start >> hello_task >> import_check >> end
+    start >> [hello_task, *import_checks] >> end
 
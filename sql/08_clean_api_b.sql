@@ -0,0 +1,77 @@
+-- ============================================
+-- Phase 5: Incremental CLEAN Updates - API B
+-- One file per source so the DAG can run the MERGEs
+-- as parallel tasks on separate sessions
+-- ============================================
+
+USE DATABASE VIDEO_ANALYTICS;
+USE SCHEMA CLEAN;
+USE WAREHOUSE PIPELINE_WH;
+
+-- First, ensure tables exist (run 07_clean_tables.sql first)
+
+-- ============================================
+-- MERGE: API B Events (Incremental)
+-- ============================================
+
+MERGE INTO CLEAN.CLN_API_B_EVENTS AS target
+USING (
+    SELECT
+        payload:id::STRING AS id,
+        payload:created_at::TIMESTAMP_NTZ AS created_at,
+        payload:modified_at::TIMESTAMP_NTZ AS modified_at,
+        payload:title::STRING AS title,
+        payload:state::STRING AS state,
+        payload:priority::STRING AS priority,
+        payload:amount::NUMBER(18, 2) AS amount,
+        payload:notes::STRING AS notes,
+        payload:user_id::STRING AS user_id,
+        payload:user_name::STRING AS user_name,
+        ingested_at,
+        batch_id,
+        file_name,
+        CURRENT_TIMESTAMP() AS _loaded_at
+    FROM RAW.API_B_EVENTS
+    WHERE ingested_at > (
+        SELECT COALESCE(MAX(_loaded_at), '1900-01-01') FROM CLEAN.CLN_API_B_EVENTS
+    )
+    QUALIFY ROW_NUMBER() OVER (
+        PARTITION BY payload:id::STRING 
+        ORDER BY payload:modified_at::TIMESTAMP_NTZ DESC NULLS LAST
+    ) = 1
+) AS source
+ON target.id = source.id
+
+WHEN MATCHED AND source.modified_at > target.modified_at THEN UPDATE SET
+    target.created_at = source.created_at,
+    target.modified_at = source.modified_at,
+    target.title = source.title,
+    target.state = source.state,
+    target.priority = source.priority,
+    target.amount = source.amount,
+    target.notes = source.notes,
+    target.user_id = source.user_id,
+    target.user_name = source.user_name,
+    target.ingested_at = source.ingested_at,
+    target.batch_id = source.batch_id,
+    target.file_name = source.file_name,
+    target._loaded_at = source._loaded_at
+
+WHEN NOT MATCHED THEN INSERT (
+    id, created_at, modified_at, title, state, priority, amount,
+    notes, user_id, user_name, ingested_at, batch_id, file_name, _loaded_at
+) VALUES (
+    source.id, source.created_at, source.modified_at, source.title, source.state,
+    source.priority, source.amount, source.notes, source.user_id, source.user_name,
+    source.ingested_at, source.batch_id, source.file_name, source._loaded_at
+);
+
+-- ============================================
+-- Verify incremental update
+-- ============================================
+
+SELECT 
+    'CLN_API_B_EVENTS' AS table_name,
+    COUNT(*) AS total_rows,
+    MAX(_loaded_at) AS last_load
+FROM CLEAN.CLN_API_B_EVENTS;
@@ -25,138 +25,92 @@ CREATE TABLE IF NOT EXISTS ANALYTICS.DQ_CHECK_RESULTS (
 );
 
 -- ============================================
--- CHECK 1: Row Count > 0 for each CLEAN table
+-- All checks in a single INSERT
+-- Each CLEAN table is scanned once (grouped by id); the
+-- four checks below are derived from those per-table stats.
+--
+-- CHECK 1: Row count > 0            (completeness)
+-- CHECK 2: No NULL primary keys     (validity)
+-- CHECK 3: Freshness within 6 hours (timeliness)
+-- CHECK 4: No duplicate primary keys (uniqueness)
 -- ============================================
 
--- API A Events - Row Count Check
-INSERT INTO ANALYTICS.DQ_CHECK_RESULTS (check_name, check_type, table_name, result_value, threshold_value, passed, error_message)
-SELECT
-    'row_count_check' AS check_name,
-    'completeness' AS check_type,
-    'CLEAN.CLN_API_A_EVENTS' AS table_name,
-    COUNT(*) AS result_value,
-    1 AS threshold_value,
-    COUNT(*) > 0 AS passed,
-    CASE WHEN COUNT(*) = 0 THEN 'Table is empty - no records found' ELSE NULL END AS error_message
-FROM CLEAN.CLN_API_A_EVENTS;
-
--- API B Events - Row Count Check
 INSERT INTO ANALYTICS.DQ_CHECK_RESULTS (check_name, check_type, table_name, result_value, threshold_value, passed, error_message)
+WITH id_counts_a AS (
+    SELECT id, COUNT(*) AS cnt, MAX(ingested_at) AS max_ingested_at
+    FROM CLEAN.CLN_API_A_EVENTS
+    GROUP BY id
+),
+id_counts_b AS (
+    SELECT id, COUNT(*) AS cnt, MAX(ingested_at) AS max_ingested_at
+    FROM CLEAN.CLN_API_B_EVENTS
+    GROUP BY id
+),
+table_stats AS (
+    SELECT
+        'CLEAN.CLN_API_A_EVENTS' AS table_name,
+        COALESCE(SUM(cnt), 0) AS row_count,
+        COALESCE(SUM(IFF(id IS NULL, cnt, 0)), 0) AS null_id_count,
+        COUNT_IF(cnt > 1) AS duplicate_id_count,
+        TIMESTAMPDIFF(HOUR, MAX(max_ingested_at), CURRENT_TIMESTAMP()) AS hours_since_ingest
+    FROM id_counts_a
+    UNION ALL
+    SELECT
+        'CLEAN.CLN_API_B_EVENTS' AS table_name,
+        COALESCE(SUM(cnt), 0) AS row_count,
+        COALESCE(SUM(IFF(id IS NULL, cnt, 0)), 0) AS null_id_count,
+        COUNT_IF(cnt > 1) AS duplicate_id_count,
+        TIMESTAMPDIFF(HOUR, MAX(max_ingested_at), CURRENT_TIMESTAMP()) AS hours_since_ingest
+    FROM id_counts_b
+)
+-- CHECK 1: Row Count > 0
 SELECT
     'row_count_check' AS check_name,
     'completeness' AS check_type,
-    'CLEAN.CLN_API_B_EVENTS' AS table_name,
-    COUNT(*) AS result_value,
+    table_name,
+    row_count AS result_value,
     1 AS threshold_value,
-    COUNT(*) > 0 AS passed,
-    CASE WHEN COUNT(*) = 0 THEN 'Table is empty - no records found' ELSE NULL END AS error_message
-FROM CLEAN.CLN_API_B_EVENTS;
-
--- ============================================
+    row_count > 0 AS passed,
+    CASE WHEN row_count = 0 THEN 'Table is empty - no records found' ELSE NULL END AS error_message
+FROM table_stats
+UNION ALL
 -- CHECK 2: No NULL Primary Keys (ID field)
--- ============================================
-
--- API A Events - Null ID Check
-INSERT INTO ANALYTICS.DQ_CHECK_RESULTS (check_name, check_type, table_name, result_value, threshold_value, passed, error_message)
 SELECT
     'null_primary_key_check' AS check_name,
     'validity' AS check_type,
-    'CLEAN.CLN_API_A_EVENTS' AS table_name,
-    COUNT(*) AS result_value,
-    0 AS threshold_value,
-    COUNT(*) = 0 AS passed,
-    CASE WHEN COUNT(*) > 0 THEN 'Found ' || COUNT(*) || ' records with NULL id' ELSE NULL END AS error_message
-FROM CLEAN.CLN_API_A_EVENTS
-WHERE id IS NULL;
-
--- API B Events - Null ID Check
-INSERT INTO ANALYTICS.DQ_CHECK_RESULTS (check_name, check_type, table_name, result_value, threshold_value, passed, error_message)
-SELECT
-    'null_primary_key_check' AS check_name,
-    'validity' AS check_type,
-    'CLEAN.CLN_API_B_EVENTS' AS table_name,
-    COUNT(*) AS result_value,
+    table_name,
+    null_id_count AS result_value,
     0 AS threshold_value,
-    COUNT(*) = 0 AS passed,
-    CASE WHEN COUNT(*) > 0 THEN 'Found ' || COUNT(*) || ' records with NULL id' ELSE NULL END AS error_message
-FROM CLEAN.CLN_API_B_EVENTS
-WHERE id IS NULL;
-
--- ============================================
--- CHECK 3: Freshness - Latest ingested_at within X hours
--- ============================================
-
--- API A Events - Freshness Check (6 hour threshold)
-INSERT INTO ANALYTICS.DQ_CHECK_RESULTS (check_name, check_type, table_name, result_value, threshold_value, passed, error_message)
-SELECT
-    'freshness_check' AS check_name,
-    'timeliness' AS check_type,
-    'CLEAN.CLN_API_A_EVENTS' AS table_name,
-    TIMESTAMPDIFF(HOUR, MAX(ingested_at), CURRENT_TIMESTAMP()) AS result_value,
-    6 AS threshold_value,
-    TIMESTAMPDIFF(HOUR, MAX(ingested_at), CURRENT_TIMESTAMP()) <= 6 AS passed,
-    CASE 
-        WHEN MAX(ingested_at) IS NULL THEN 'No data found - cannot check freshness'
-        WHEN TIMESTAMPDIFF(HOUR, MAX(ingested_at), CURRENT_TIMESTAMP()) > 6 
-        THEN 'Data is ' || TIMESTAMPDIFF(HOUR, MAX(ingested_at), CURRENT_TIMESTAMP()) || ' hours old (threshold: 6 hours)'
-        ELSE NULL 
-    END AS error_message
-FROM CLEAN.CLN_API_A_EVENTS;
-
--- API B Events - Freshness Check (6 hour threshold)
-INSERT INTO ANALYTICS.DQ_CHECK_RESULTS (check_name, check_type, table_name, result_value, threshold_value, passed, error_message)
+    null_id_count = 0 AS passed,
+    CASE WHEN null_id_count > 0 THEN 'Found ' || null_id_count || ' records with NULL id' ELSE NULL END AS error_message
+FROM table_stats
+UNION ALL
+-- CHECK 3: Freshness - Latest ingested_at within 6 hours
 SELECT
     'freshness_check' AS check_name,
     'timeliness' AS check_type,
-    'CLEAN.CLN_API_B_EVENTS' AS table_name,
-    TIMESTAMPDIFF(HOUR, MAX(ingested_at), CURRENT_TIMESTAMP()) AS result_value,
+    table_name,
+    hours_since_ingest AS result_value,
     6 AS threshold_value,
-    TIMESTAMPDIFF(HOUR, MAX(ingested_at), CURRENT_TIMESTAMP()) <= 6 AS passed,
-    CASE 
-        WHEN MAX(ingested_at) IS NULL THEN 'No data found - cannot check freshness'
-        WHEN TIMESTAMPDIFF(HOUR, MAX(ingested_at), CURRENT_TIMESTAMP()) > 6 
-        THEN 'Data is ' || TIMESTAMPDIFF(HOUR, MAX(ingested_at), CURRENT_TIMESTAMP()) || ' hours old (threshold: 6 hours)'
-        ELSE NULL 
+    hours_since_ingest <= 6 AS passed,
+    CASE
+        WHEN hours_since_ingest IS NULL THEN 'No data found - cannot check freshness'
+        WHEN hours_since_ingest > 6
+        THEN 'Data is ' || hours_since_ingest || ' hours old (threshold: 6 hours)'
+        ELSE NULL
     END AS error_message
-FROM CLEAN.CLN_API_B_EVENTS;
-
--- ============================================
+FROM table_stats
+UNION ALL
 -- CHECK 4: No Duplicate Primary Keys
--- ============================================
-
--- API A Events - Duplicate Check
-INSERT INTO ANALYTICS.DQ_CHECK_RESULTS (check_name, check_type, table_name, result_value, threshold_value, passed, error_message)
 SELECT
     'duplicate_primary_key_check' AS check_name,
     'uniqueness' AS check_type,
-    'CLEAN.CLN_API_A_EVENTS' AS table_name,
-    COUNT(*) AS result_value,
-    0 AS threshold_value,
-    COUNT(*) = 0 AS passed,
-    CASE WHEN COUNT(*) > 0 THEN 'Found ' || COUNT(*) || ' duplicate id values' ELSE NULL END AS error_message
-FROM (
-    SELECT id, COUNT(*) AS cnt
-    FROM CLEAN.CLN_API_A_EVENTS
-    GROUP BY id
-    HAVING cnt > 1
-);
-
--- API B Events - Duplicate Check
-INSERT INTO ANALYTICS.DQ_CHECK_RESULTS (check_name, check_type, table_name, result_value, threshold_value, passed, error_message)
-SELECT
-    'duplicate_primary_key_check' AS check_name,
-    'uniqueness' AS check_type,
-    'CLEAN.CLN_API_B_EVENTS' AS table_name,
-    COUNT(*) AS result_value,
+    table_name,
+    duplicate_id_count AS result_value,
     0 AS threshold_value,
-    COUNT(*) = 0 AS passed,
-    CASE WHEN COUNT(*) > 0 THEN 'Found ' || COUNT(*) || ' duplicate id values' ELSE NULL END AS error_message
-FROM (
-    SELECT id, COUNT(*) AS cnt
-    FROM CLEAN.CLN_API_B_EVENTS
-    GROUP BY id
-    HAVING cnt > 1
-);
+    duplicate_id_count = 0 AS passed,
+    CASE WHEN duplicate_id_count > 0 THEN 'Found ' || duplicate_id_count || ' duplicate id values' ELSE NULL END AS error_message
+FROM table_stats;
 
 -- ============================================
 -- View Latest DQ Results
@@ -37,6 +37,10 @@ class APIKeyAuth:
         self.key_name = key_name
         self.location = location
         
+        # Location is fixed, so build the per-request dicts once
+        self._header = {key_name: api_key} if location is APIKeyLocation.HEADER else {}
+        self._params = {key_name: api_key} if location is APIKeyLocation.QUERY else {}
+        
         logger.debug(
             "APIKeyAuth initialized",
             extra={"key_name": key_name, "location": location.value}
@@ -45,20 +49,18 @@ class APIKeyAuth:
     def get_auth_header(self) -> dict:
         """Get authorization header dict for requests.
         
-        Returns empty dict if location is QUERY.
+        Returns empty dict if location is QUERY. The dict is shared; do not
+        mutate it.
         """
-        if self.location == APIKeyLocation.HEADER:
-            return {self.key_name: self.api_key}
-        return {}
+        return self._header
     
     def get_auth_params(self) -> dict:
         """Get query parameters dict for requests.
         
-        Returns empty dict if location is HEADER.
+        Returns empty dict if location is HEADER. The dict is shared; do not
+        mutate it.
         """
-        if self.location == APIKeyLocation.QUERY:
-            return {self.key_name: self.api_key}
-        return {}
+        return self._params
     
     def apply_auth(
         self,
@@ -72,13 +74,7 @@ class APIKeyAuth:
             params: Existing params dict (or None)
             
         Returns:
-            Tuple of (headers, params) with auth applied
+            New (headers, params) dicts with auth applied
         """
-        headers = headers or {}
-        params = params or {}
-        
-        headers.update(self.get_auth_header())
-        params.update(self.get_auth_params())
-        
-        return headers, params
+        return {**(headers or {}), **self._header}, {**(params or {}), **self._params}
 
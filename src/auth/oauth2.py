@@ -1,8 +1,14 @@
 """OAuth2 authentication with automatic token refresh."""
 
+import hashlib
+import json
+import os
+import tempfile
+import threading
 import time
 import logging
-from dataclasses import dataclass
+from dataclasses import dataclass, field
+from pathlib import Path
 from typing import Optional
 
 import requests
@@ -19,14 +25,96 @@ class TokenInfo:
     expires_at: float
     refresh_token: Optional[str] = None
     scope: Optional[str] = None
+    auth_header: dict = field(init=False, repr=False, compare=False)
+    
+    def __post_init__(self):
+        # Built once per token rather than on every request
+        self.auth_header = {"Authorization": f"{self.token_type} {self.access_token}"}
+
+
+# Process-wide token cache shared by OAuth2Client instances with the same
+# credentials. Keys are hashed so secrets never sit in the dict.
+_TOKEN_CACHE: dict[str, TokenInfo] = {}
+_TOKEN_LOCK = threading.Lock()
+
+# Optional on-disk layer so tokens survive worker process recycles.
+# Disabled unless OAUTH_TOKEN_CACHE_DIR is set.
+TOKEN_CACHE_DIR_ENV = "OAUTH_TOKEN_CACHE_DIR"
+
+
+def _disk_token_path(cache_key: str) -> Optional[Path]:
+    """Get the on-disk token file for a cache key (None if disabled)."""
+    cache_dir = os.getenv(TOKEN_CACHE_DIR_ENV)
+    if not cache_dir:
+        return None
+    return Path(cache_dir) / f"{cache_key}.json"
+
+
+def _load_disk_token(cache_key: str) -> Optional[TokenInfo]:
+    """Load a token from disk; missing or unreadable files are a cache miss."""
+    path = _disk_token_path(cache_key)
+    if path is None:
+        return None
+    
+    try:
+        data = json.loads(path.read_text())
+        return TokenInfo(
+            access_token=data["access_token"],
+            token_type=data["token_type"],
+            expires_at=data["expires_at"],
+            scope=data.get("scope"),
+        )
+    except (OSError, ValueError, KeyError):
+        return None
+
+
+def _save_disk_token(cache_key: str, token_info: TokenInfo) -> None:
+    """Atomically write a token to disk (owner-only; no refresh token)."""
+    path = _disk_token_path(cache_key)
+    if path is None:
+        return
+    
+    data = {
+        "access_token": token_info.access_token,
+        "token_type": token_info.token_type,
+        "expires_at": token_info.expires_at,
+        "scope": token_info.scope,
+    }
+    
+    try:
+        path.parent.mkdir(mode=0o700, parents=True, exist_ok=True)
+        # mkstemp creates the file with 0600 permissions
+        fd, tmp_path = tempfile.mkstemp(dir=path.parent, suffix=".tmp")
+        with os.fdopen(fd, "w") as f:
+            json.dump(data, f)
+        os.replace(tmp_path, path)
+    except OSError as e:
+        logger.warning("Could not persist OAuth2 token", extra={"error": str(e)})
+
+
+def _delete_disk_token(cache_key: str) -> None:
+    """Remove a token file if present."""
+    path = _disk_token_path(cache_key)
+    if path is not None:
+        path.unlink(missing_ok=True)
 
 
 class OAuth2Client:
     """OAuth2 client with automatic token refresh.
     
-    Supports client_credentials and refresh_token grant types.
+    Supports client_credentials and refresh_token grant types. Tokens are
+    shared through a process-wide cache, so new instances with the same
+    credentials reuse a valid token instead of requesting one, and are
+    refreshed by a background timer shortly before they expire, as long as
+    the client used the token since the last refresh. Call close() when
+    done to cancel the timer. When
+    OAUTH_TOKEN_CACHE_DIR is set, access tokens are also persisted there so
+    new worker processes can reuse them.
     """
     
+    # Seconds before the expiry buffer at which the background refresh fires
+    REFRESH_LEAD_SECONDS = 5
+    
     def __init__(
         self,
         client_id: str,
@@ -53,18 +141,94 @@ class OAuth2Client:
         self.scope = scope
         self.token_expiry_buffer = token_expiry_buffer
         self._token_info: Optional[TokenInfo] = None
+        self._refresh_timer: Optional[threading.Timer] = None
+        # Set by get_access_token(); an idle client stops refreshing
+        self._token_used = False
+        self._closed = False
+        self._cache_key = hashlib.sha256(
+            f"{token_url}|{client_id}|{client_secret}|{scope}".encode()
+        ).hexdigest()
     
     def get_access_token(self) -> str:
-        """Get valid access token, refreshing if necessary."""
-        if self._token_info is None or self._is_token_expired():
-            self._refresh_access_token()
+        """Get valid access token, refreshing if necessary.
+        
+        Normally the background timer has already refreshed the token; the
+        synchronous refresh here is the fallback (first call, failed timer).
+        """
+        if self._is_token_expired():
+            # Holding the lock while refreshing means concurrent callers
+            # wait for one token request instead of each making their own
+            # Lookup order: process memory -> disk -> token endpoint
+            with _TOKEN_LOCK:
+                cached = _TOKEN_CACHE.get(self._cache_key)
+                if self._is_token_expired(cached):
+                    cached = _load_disk_token(self._cache_key)
+                    if not self._is_token_expired(cached):
+                        _TOKEN_CACHE[self._cache_key] = cached
+                        self._schedule_refresh(cached.expires_at - time.time())
+                
+                if not self._is_token_expired(cached):
+                    self._token_info = cached
+                else:
+                    self._refresh_access_token()
+        self._token_used = True
         return self._token_info.access_token
     
-    def _is_token_expired(self) -> bool:
-        """Check if current token is expired or about to expire."""
-        if self._token_info is None:
+    def invalidate(self) -> None:
+        """Drop this client's token from the memory and disk caches (e.g. after a 401)."""
+        self._cancel_refresh_timer()
+        with _TOKEN_LOCK:
+            _TOKEN_CACHE.pop(self._cache_key, None)
+            _delete_disk_token(self._cache_key)
+        self._token_info = None
+    
+    def close(self) -> None:
+        """Stop background refreshes; the cached token stays valid for others."""
+        # Taken so a refresh already running on the timer thread cannot
+        # re-arm the timer after it has been cancelled
+        with _TOKEN_LOCK:
+            self._closed = True
+            self._cancel_refresh_timer()
+    
+    def _cancel_refresh_timer(self) -> None:
+        """Cancel a pending background refresh, if any."""
+        if self._refresh_timer is not None:
+            self._refresh_timer.cancel()
+            self._refresh_timer = None
+    
+    def _schedule_refresh(self, expires_in: float) -> None:
+        """Schedule a background refresh just before the token expires."""
+        self._cancel_refresh_timer()
+        if self._closed:
+            return
+        delay = max(1, expires_in - self.token_expiry_buffer - self.REFRESH_LEAD_SECONDS)
+        self._refresh_timer = threading.Timer(delay, self._background_refresh)
+        self._refresh_timer.daemon = True
+        self._refresh_timer.start()
+    
+    def _background_refresh(self) -> None:
+        """Refresh the token off the request path (runs on the timer thread)."""
+        try:
+            with _TOKEN_LOCK:
+                if self._closed or not self._token_used:
+                    # Idle since the last refresh: let the token lapse, and
+                    # get_access_token() fetches one if the client is used again
+                    self._refresh_timer = None
+                    return
+                self._refresh_access_token()
+        except requests.exceptions.RequestException as e:
+            # get_access_token() will retry synchronously once the token expires
+            logger.warning(
+                "Background token refresh failed",
+                extra={"error": str(e)}
+            )
+    
+    def _is_token_expired(self, token_info: Optional[TokenInfo] = None) -> bool:
+        """Check if a token (default: current) is expired or about to expire."""
+        token_info = token_info or self._token_info
+        if token_info is None:
             return True
-        return time.time() >= (self._token_info.expires_at - self.token_expiry_buffer)
+        return time.time() >= (token_info.expires_at - self.token_expiry_buffer)
     
     def _refresh_access_token(self) -> None:
         """Refresh the access token."""
@@ -102,6 +266,8 @@ class OAuth2Client:
     
     def _request_token(self, data: dict) -> None:
         """Make token request and update token info."""
+        self._cancel_refresh_timer()
+        
         response = requests.post(
             self.token_url,
             data=data,
@@ -121,6 +287,11 @@ class OAuth2Client:
             scope=token_data.get("scope", self.scope),
         )
         
+        _TOKEN_CACHE[self._cache_key] = self._token_info
+        _save_disk_token(self._cache_key, self._token_info)
+        self._token_used = False
+        self._schedule_refresh(expires_in)
+        
         # Update refresh token if a new one was provided
         if token_data.get("refresh_token"):
             self.refresh_token = token_data["refresh_token"]
@@ -134,8 +305,11 @@ class OAuth2Client:
         )
     
     def get_auth_header(self) -> dict:
-        """Get authorization header dict for requests."""
-        token = self.get_access_token()
-        token_type = self._token_info.token_type if self._token_info else "Bearer"
-        return {"Authorization": f"{token_type} {token}"}
+        """Get authorization header dict for requests.
+        
+        The dict is shared by every request using the same token; do not
+        mutate it.
+        """
+        self.get_access_token()
+        return self._token_info.auth_header
 
@@ -2,6 +2,7 @@
 
 import logging
 import os
+from concurrent.futures import ThreadPoolExecutor
 from typing import Generator, Optional
 
 from src.auth.oauth2 import OAuth2Client
@@ -15,7 +16,7 @@ class ApiAClient(BaseAPIClient):
     
     Features:
     - OAuth2 token refresh flow
-    - Cursor-based pagination
+    - Cursor-based pagination (next page prefetched while yielding)
     - Rate limiting (100 requests/minute)
     - Automatic retries with exponential backoff
     """
@@ -60,11 +61,16 @@ class ApiAClient(BaseAPIClient):
         """Get OAuth2 authorization headers."""
         return self.oauth_client.get_auth_header()
     
-    def paginate(
+    def close(self) -> None:
+        """Close the session and stop the OAuth2 background refresh."""
+        self.oauth_client.close()
+        super().close()
+    
+    def paginate_pages(
         self,
         endpoint: str,
         params: Optional[dict] = None,
-    ) -> Generator[dict, None, None]:
+    ) -> Generator[list[dict], None, None]:
         """Paginate through API results using cursor-based pagination.
         
         Assumes API returns:
@@ -73,41 +79,65 @@ class ApiAClient(BaseAPIClient):
             "meta": {"next_cursor": "..."}
         }
         
+        A `Link: <...>; rel="next"` header takes precedence over
+        meta.next_cursor when the API sends one. The next page is requested
+        in a background thread before the current page is yielded.
+        
         Yields:
-            Individual records from paginated responses
+            Each page's list of records
         """
         params = params or {}
-        cursor = None
         page = 0
+        debug = logger.isEnabledFor(logging.DEBUG)
         
-        while True:
-            page += 1
-            request_params = {**params}
-            if cursor:
-                request_params["cursor"] = cursor
-            
-            logger.debug(f"Fetching page {page}", extra={"cursor": cursor})
-            
-            response = self.get(endpoint, params=request_params)
+        # Request page N+1 as soon as its cursor is known, so the HTTP call
+        # overlaps with the consumer processing page N
+        with ThreadPoolExecutor(max_workers=1) as executor:
+            if debug:
+                logger.debug("Fetching page 1", extra={"cursor": None})
+            next_page = executor.submit(
+                self.get_with_next_link, endpoint, params={**params}
+            )
             
-            # Extract data array
-            data = response.get("data", [])
-            if not data:
-                logger.debug("No more data, stopping pagination")
-                break
-            
-            for record in data:
-                yield record
-            
-            # Check for next cursor
-            meta = response.get("meta", {})
-            cursor = meta.get("next_cursor")
-            
-            if not cursor:
-                logger.debug("No next cursor, pagination complete")
-                break
+            while next_page is not None:
+                page += 1
+                response, next_url = next_page.result()
+                
+                # Extract data array
+                data = response.get("data", [])
+                if not data:
+                    if debug:
+                        logger.debug("No more data, stopping pagination")
+                    break
+                
+                # Link header already carries the full next-page URL
+                if next_url:
+                    if debug:
+                        logger.debug("Fetching page %d", page + 1, extra={"url": next_url})
+                    next_page = executor.submit(self.get_with_next_link, next_url)
+                    yield data
+                    continue
+                
+                # Otherwise check for next cursor
+                meta = response.get("meta", {})
+                cursor = meta.get("next_cursor")
+                
+                if cursor:
+                    if debug:
+                        logger.debug("Fetching page %d", page + 1, extra={"cursor": cursor})
+                    next_page = executor.submit(
+                        self.get_with_next_link,
+                        endpoint,
+                        params={**params, "cursor": cursor},
+                    )
+                else:
+                    if debug:
+                        logger.debug("No next cursor, pagination complete")
+                    next_page = None
+                
+                yield data
         
-        logger.info(f"Pagination complete after {page} pages")
+        logger.info("Pagination complete after %d pages", page)
     
     def fetch(self, since: Optional[str] = None) -> list[dict]:
         """Fetch all events from API A.
@@ -128,7 +158,7 @@ class ApiAClient(BaseAPIClient):
         else:
             logger.info("Fetching all events (full load)")
         
-        records = list(self.paginate(endpoint, params))
+        records = self.collect_pages(endpoint, params)
         
         logger.info(
             f"Fetched {len(records)} records from API A",
@@ -140,4 +170,43 @@ class ApiAClient(BaseAPIClient):
         )
         
         return records
-
+    
+    def iter_records(self, since: Optional[str] = None) -> Generator[dict, None, None]:
+        """Stream event records from API A as pages arrive.
+        
+        Lazy alternative to fetch() for callers that process records one at
+        a time, so the full result is never held as a list.
+        
+        Args:
+            since: Optional ISO timestamp for incremental fetch
+        
+        Yields:
+            Individual records
+        """
+        params = {"updated_since": since} if since else {}
+        return self.paginate("events", params)
+    
+    def fetch_arrow(self, since: Optional[str] = None):
+        """Fetch all events from API A as a pyarrow Table.
+        
+        Columnar alternative to fetch(); requires pyarrow.
+        
+        Args:
+            since: Optional ISO timestamp for incremental fetch
+        
+        Returns:
+            pyarrow.Table of records
+        """
+        params = {"updated_since": since} if since else {}
+        table = self.collect_arrow("events", params)
+        
+        logger.info(
+            f"Fetched {table.num_rows} records from API A",
+            extra={
+                "source": "api_a",
+                "record_count": table.num_rows,
+                "incremental": since is not None,
+            }
+        )
+        
+        return table
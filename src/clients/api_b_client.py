@@ -15,7 +15,7 @@ class ApiBClient(BaseAPIClient):
     
     Features:
     - API key authentication (header-based)
-    - Offset-based pagination
+    - Offset-based pagination (remaining pages fetched concurrently)
     - Rate limiting
     - Automatic retries with exponential backoff
     """
@@ -66,11 +66,11 @@ class ApiBClient(BaseAPIClient):
         """Get API key authorization headers."""
         return self.api_key_auth.get_auth_header()
     
-    def paginate(
+    def paginate_pages(
         self,
         endpoint: str,
         params: Optional[dict] = None,
-    ) -> Generator[dict, None, None]:
+    ) -> Generator[list[dict], None, None]:
         """Paginate through API results using offset-based pagination.
         
         Assumes API returns:
@@ -81,49 +81,46 @@ class ApiBClient(BaseAPIClient):
             "limit": 100
         }
         
+        The first page is fetched alone to learn the total; the remaining
+        pages are fetched concurrently via iter_many() and each is yielded,
+        in order, as soon as it arrives.
+        
         Yields:
-            Individual records from paginated responses
+            Each page's list of records
         """
         params = params or {}
-        offset = 0
-        total_fetched = 0
-        page = 0
+        debug = logger.isEnabledFor(logging.DEBUG)
+        
+        # First page is sequential: it tells us the total
+        if debug:
+            logger.debug("Fetching page 1", extra={"offset": 0, "limit": self.page_size})
+        response = self.get(endpoint, params={**params, "offset": 0, "limit": self.page_size})
+        
+        items = response.get("items", [])
+        if items:
+            yield items
+        total_fetched = len(items)
+        total = response.get("total", 0) if items else 0
         
-        while True:
+        # Remaining offsets are known up front, so fetch them concurrently
+        params_list = [
+            {**params, "offset": offset, "limit": self.page_size}
+            for offset in range(self.page_size, total, self.page_size)
+        ]
+        page = 1
+        
+        for response in self.iter_many(endpoint, params_list):
             page += 1
-            request_params = {
-                **params,
-                "offset": offset,
-                "limit": self.page_size,
-            }
-            
-            logger.debug(
-                f"Fetching page {page}",
-                extra={"offset": offset, "limit": self.page_size}
-            )
-            
-            response = self.get(endpoint, params=request_params)
-            
-            # Extract items array
             items = response.get("items", [])
             if not items:
-                logger.debug("No more items, stopping pagination")
+                if debug:
+                    logger.debug("No more items, stopping pagination")
                 break
             
-            for record in items:
-                yield record
-            
+            yield items
             total_fetched += len(items)
-            
-            # Check if we've fetched all records
-            total = response.get("total", 0)
-            if total_fetched >= total:
-                logger.debug(f"Fetched all {total} records")
-                break
-            
-            offset += self.page_size
         
-        logger.info(f"Pagination complete: {total_fetched} records in {page} pages")
+        logger.info("Pagination complete: %d records in %d pages", total_fetched, page)
     
     def fetch(self, since: Optional[str] = None) -> list[dict]:
         """Fetch all data from API B.
@@ -144,7 +141,7 @@ class ApiBClient(BaseAPIClient):
         else:
             logger.info("Fetching all data (full load)")
         
-        records = list(self.paginate(endpoint, params))
+        records = self.collect_pages(endpoint, params)
         
         logger.info(
             f"Fetched {len(records)} records from API B",
@@ -156,4 +153,43 @@ class ApiBClient(BaseAPIClient):
         )
         
         return records
-
+    
+    def iter_records(self, since: Optional[str] = None) -> Generator[dict, None, None]:
+        """Stream data records from API B as pages arrive.
+        
+        Lazy alternative to fetch() for callers that process records one at
+        a time, so the full result is never held as a list.
+        
+        Args:
+            since: Optional ISO timestamp for incremental fetch
+        
+        Yields:
+            Individual records
+        """
+        params = {"modified_after": since} if since else {}
+        return self.paginate("data", params)
+    
+    def fetch_arrow(self, since: Optional[str] = None):
+        """Fetch all data from API B as a pyarrow Table.
+        
+        Columnar alternative to fetch(); requires pyarrow.
+        
+        Args:
+            since: Optional ISO timestamp for incremental fetch
+        
+        Returns:
+            pyarrow.Table of records
+        """
+        params = {"modified_after": since} if since else {}
+        table = self.collect_arrow("data", params)
+        
+        logger.info(
+            f"Fetched {table.num_rows} records from API B",
+            extra={
+                "source": "api_b",
+                "record_count": table.num_rows,
+                "incremental": since is not None,
+            }
+        )
+        
+        return table
@@ -1,49 +1,163 @@
 """Base API client with common functionality."""
 
+import json
 import logging
+import socket
+import statistics
+import threading
 import time
 from abc import ABC, abstractmethod
+from collections import OrderedDict, deque
+from concurrent.futures import ThreadPoolExecutor
 from dataclasses import dataclass, field
+from functools import lru_cache
 from typing import Any, Generator, Optional
+from urllib.parse import urlsplit
 
 import requests
 from requests.adapters import HTTPAdapter
+from urllib3.connection import HTTPConnection
 from urllib3.util.retry import Retry
 
+# orjson decodes pages several times faster than the stdlib json module;
+# fall back to json when it is not installed
+try:
+    import orjson
+    _json_loads = orjson.loads
+    _json_dumps = orjson.dumps
+except ImportError:
+    _json_loads = json.loads
+    
+    def _json_dumps(obj: Any) -> bytes:
+        return json.dumps(obj, separators=(",", ":")).encode()
+
 logger = logging.getLogger(__name__)
 
+# Upper bound on urllib3's exponential backoff between retries
+MAX_BACKOFF_SECONDS = 120
+
+# Random extra delay added to each backoff so parallel clients that were
+# throttled together don't all retry at the same instant
+BACKOFF_JITTER_SECONDS = 0.5
+
+# Idle time before TCP keep-alive probes start on pooled connections; keeps
+# NATs and load balancers from silently dropping them between pages
+TCP_KEEPALIVE_IDLE_SECONDS = 60
+
+
+RECENT_DURATIONS_SIZE = 1024
+
+# Max entries in the optional GET response cache (LRU eviction)
+RESPONSE_CACHE_SIZE = 1024
+
+class TokenBucket:
+    """Token bucket allowing `capacity` requests per `period` seconds.
+    
+    State is two floats, so each acquire is constant time regardless of
+    the limit. Thread-safe; a caller that has to wait holds the lock, so
+    the others queue behind it.
+    """
+    
+    def __init__(self, capacity: int, period: float):
+        self.capacity = float(capacity)
+        self.refill_rate = capacity / period
+        self.tokens = float(capacity)
+        self.last_refill = time.monotonic()
+        self._lock = threading.Lock()
+    
+    def acquire(self) -> None:
+        """Take one token, sleeping until one is available."""
+        with self._lock:
+            now = time.monotonic()
+            self.tokens = min(
+                self.capacity,
+                self.tokens + (now - self.last_refill) * self.refill_rate,
+            )
+            self.last_refill = now
+            
+            if self.tokens >= 1:
+                self.tokens -= 1
+                return
+            
+            wait_time = (1 - self.tokens) / self.refill_rate
+            logger.warning(
+                f"Rate limit reached, waiting {wait_time:.2f}s",
+                extra={"wait_seconds": wait_time}
+            )
+            time.sleep(wait_time)
+            self.tokens = 0.0
+            self.last_refill = time.monotonic()
+
+
+# Process-wide token buckets shared by clients that call the same host with
+# the same limit (APIs limit per host/key, not per base path), so parallel
+# clients in one worker don't each get a full budget. Cross-worker limits
+# are enforced by the Airflow pools.
+_RATE_BUCKETS: dict[tuple[str, int, int], TokenBucket] = {}
+_RATE_BUCKETS_LOCK = threading.Lock()
+
+
+def _shared_rate_bucket(
+    base_url: str,
+    rate_limit_requests: int,
+    rate_limit_period: int,
+) -> TokenBucket:
+    """Get (or create) the token bucket for an API host."""
+    key = (urlsplit(base_url).netloc, rate_limit_requests, rate_limit_period)
+    with _RATE_BUCKETS_LOCK:
+        bucket = _RATE_BUCKETS.get(key)
+        if bucket is None:
+            bucket = _RATE_BUCKETS[key] = TokenBucket(
+                rate_limit_requests, rate_limit_period
+            )
+        return bucket
+
 
 @dataclass
 class RequestMetrics:
-    """Metrics for API requests."""
+    """Metrics for API requests.
+    
+    Averages come from running totals; percentiles from a fixed-size window
+    of the most recent durations, so memory stays constant per client.
+    """
     
     total_requests: int = 0
     successful_requests: int = 0
     failed_requests: int = 0
     total_retries: int = 0
     total_duration_ms: float = 0
-    request_durations: list[float] = field(default_factory=list)
+    recent_durations: deque[float] = field(
+        default_factory=lambda: deque(maxlen=RECENT_DURATIONS_SIZE),
+        repr=False,
+    )
     
     def record_request(self, duration_ms: float, success: bool) -> None:
         """Record a request."""
         self.total_requests += 1
         self.total_duration_ms += duration_ms
-        self.request_durations.append(duration_ms)
+        self.recent_durations.append(duration_ms)
         if success:
             self.successful_requests += 1
         else:
             self.failed_requests += 1
     
-    def record_retry(self) -> None:
-        """Record a retry."""
-        self.total_retries += 1
+    def record_retry(self, count: int = 1) -> None:
+        """Record one or more retries."""
+        self.total_retries += count
     
     @property
     def avg_duration_ms(self) -> float:
         """Average request duration."""
-        if not self.request_durations:
+        if not self.total_requests:
             return 0
-        return sum(self.request_durations) / len(self.request_durations)
+        return self.total_duration_ms / self.total_requests
+    
+    @property
+    def p95_duration_ms(self) -> float:
+        """95th percentile of recent request durations."""
+        if len(self.recent_durations) < 2:
+            return self.recent_durations[0] if self.recent_durations else 0
+        return statistics.quantiles(self.recent_durations, n=20)[-1]
     
     def to_dict(self) -> dict:
         """Convert to dictionary."""
@@ -54,9 +168,56 @@ class RequestMetrics:
             "total_retries": self.total_retries,
             "total_duration_ms": round(self.total_duration_ms, 2),
             "avg_duration_ms": round(self.avg_duration_ms, 2),
+            "p95_duration_ms": round(self.p95_duration_ms, 2),
         }
 
 
+class KeepAliveHTTPAdapter(HTTPAdapter):
+    """HTTPAdapter whose pooled sockets send TCP keep-alive probes."""
+    
+    def init_poolmanager(self, *args, **kwargs):
+        socket_options = list(HTTPConnection.default_socket_options)
+        socket_options.append((socket.SOL_SOCKET, socket.SO_KEEPALIVE, 1))
+        # TCP_KEEPIDLE is Linux-only; elsewhere the OS default idle applies
+        if hasattr(socket, "TCP_KEEPIDLE"):
+            socket_options.append(
+                (socket.IPPROTO_TCP, socket.TCP_KEEPIDLE, TCP_KEEPALIVE_IDLE_SECONDS)
+            )
+        kwargs.setdefault("socket_options", socket_options)
+        super().init_poolmanager(*args, **kwargs)
+
+
+@lru_cache(maxsize=8)
+def _shared_adapter(
+    max_retries: int,
+    backoff_factor: float,
+    max_concurrency: int,
+) -> KeepAliveHTTPAdapter:
+    """Get the process-wide HTTP adapter for a retry/concurrency config.
+    
+    Clients with the same settings share one adapter, and with it one
+    urllib3 PoolManager, so short-lived clients reuse warm connections
+    instead of each opening their own. urllib3 retries 429s too, sleeping
+    for Retry-After (seconds or HTTP-date) when present.
+    """
+    retry_strategy = Retry(
+        total=max_retries,
+        backoff_factor=backoff_factor,
+        backoff_max=MAX_BACKOFF_SECONDS,
+        backoff_jitter=BACKOFF_JITTER_SECONDS,
+        status_forcelist=[429, 500, 502, 503, 504],
+        allowed_methods=["GET", "POST"],
+        respect_retry_after_header=True,
+    )
+    # One pooled connection per concurrent request, per host; a few host
+    # pools since clients for different APIs share the adapter
+    return KeepAliveHTTPAdapter(
+        max_retries=retry_strategy,
+        pool_connections=4,
+        pool_maxsize=max_concurrency,
+    )
+
+
 class BaseAPIClient(ABC):
     """Base class for API clients with retry and rate limiting support."""
     
@@ -68,6 +229,8 @@ class BaseAPIClient(ABC):
         backoff_factor: float = 0.5,
         rate_limit_requests: int = 100,
         rate_limit_period: int = 60,
+        max_concurrency: int = 8,
+        cache_ttl_seconds: float = 0,
     ):
         """Initialize base API client.
         
@@ -78,59 +241,84 @@ class BaseAPIClient(ABC):
             backoff_factor: Exponential backoff factor
             rate_limit_requests: Max requests per period
             rate_limit_period: Rate limit period in seconds
+            max_concurrency: Max in-flight requests for iter_many()
+            cache_ttl_seconds: Reuse GET responses for identical endpoint and
+                params within this many seconds (0 disables the cache)
         """
         self.base_url = base_url.rstrip("/")
         self.timeout = timeout
         self.max_retries = max_retries
         self.rate_limit_requests = rate_limit_requests
         self.rate_limit_period = rate_limit_period
+        self.max_concurrency = max_concurrency
+        
+        # endpoint -> full URL; clients hit a handful of endpoints many times
+        self._url_cache: dict[str, str] = {}
         
-        # Request tracking for rate limiting
-        self._request_timestamps: list[float] = []
+        # (endpoint, params) -> (monotonic time fetched, response body)
+        self.cache_ttl_seconds = cache_ttl_seconds
+        self._response_cache: OrderedDict[tuple, tuple[float, dict]] = OrderedDict()
+        self._response_cache_lock = threading.Lock()
+        
+        # Rate limiter shared by iter_many() threads and by other clients of
+        # the same API host in this process
+        self._rate_bucket = _shared_rate_bucket(
+            self.base_url, rate_limit_requests, rate_limit_period
+        )
         
         # Metrics tracking
         self.metrics = RequestMetrics()
+        self._metrics_lock = threading.Lock()
         
-        # Setup session with retry strategy
+        # Setup session with the shared retrying, pooled adapter. Sessions
+        # advertise every encoding urllib3 can decode: gzip/deflate, plus
+        # zstd when zstandard is installed (it is in requirements.txt).
         self.session = requests.Session()
-        retry_strategy = Retry(
-            total=max_retries,
-            backoff_factor=backoff_factor,
-            status_forcelist=[429, 500, 502, 503, 504],
-            allowed_methods=["GET", "POST"],
-        )
-        adapter = HTTPAdapter(max_retries=retry_strategy)
+        adapter = _shared_adapter(max_retries, backoff_factor, max_concurrency)
         self.session.mount("http://", adapter)
         self.session.mount("https://", adapter)
     
+    def close(self) -> None:
+        """Close the session.
+        
+        Pooled connections belong to the shared adapter and stay open for
+        other clients, so the adapters are unmounted rather than closed.
+        """
+        self.session.adapters.clear()
+        self.session.close()
+    
+    def __enter__(self):
+        return self
+    
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+    
     @abstractmethod
     def get_auth_headers(self) -> dict:
         """Get authentication headers for requests."""
         pass
     
-    def _wait_for_rate_limit(self) -> None:
-        """Wait if necessary to respect rate limits."""
-        now = time.time()
+    def _build_url(self, endpoint: str) -> str:
+        """Resolve an endpoint to a full URL, cached per client.
         
-        # Remove timestamps outside the rate limit window
-        self._request_timestamps = [
-            ts for ts in self._request_timestamps
-            if now - ts < self.rate_limit_period
-        ]
+        Absolute URLs (e.g. from a Link header) are used as-is and not
+        cached, since each one is typically requested once.
+        """
+        if endpoint.startswith(("http://", "https://")):
+            return endpoint
         
-        if len(self._request_timestamps) >= self.rate_limit_requests:
-            # Calculate wait time
-            oldest = min(self._request_timestamps)
-            wait_time = self.rate_limit_period - (now - oldest)
-            
-            if wait_time > 0:
-                logger.warning(
-                    f"Rate limit reached, waiting {wait_time:.2f}s",
-                    extra={"wait_seconds": wait_time}
-                )
-                time.sleep(wait_time)
+        url = self._url_cache.get(endpoint)
+        if url is None:
+            url = self._url_cache[endpoint] = f"{self.base_url}/{endpoint.lstrip('/')}"
+        return url
+    
+    def _wait_for_rate_limit(self) -> None:
+        """Wait if necessary to respect rate limits.
         
-        self._request_timestamps.append(time.time())
+        Up to rate_limit_requests may burst at once; after that requests
+        are spaced evenly at rate_limit_requests per rate_limit_period.
+        """
+        self._rate_bucket.acquire()
     
     def _make_request(
         self,
@@ -139,17 +327,15 @@ class BaseAPIClient(ABC):
         params: Optional[dict] = None,
         json_data: Optional[dict] = None,
         headers: Optional[dict] = None,
-        _retry_count: int = 0,
     ) -> requests.Response:
         """Make HTTP request with rate limiting, timing, and logging.
         
         Args:
             method: HTTP method (GET, POST, etc.)
-            endpoint: API endpoint (will be joined with base_url)
+            endpoint: API endpoint (joined with base_url) or absolute URL
             params: Query parameters
             json_data: JSON body data
             headers: Additional headers
-            _retry_count: Internal retry counter
             
         Returns:
             Response object
@@ -159,79 +345,78 @@ class BaseAPIClient(ABC):
         """
         self._wait_for_rate_limit()
         
-        url = f"{self.base_url}/{endpoint.lstrip('/')}"
+        url = self._build_url(endpoint)
         
+        # Auth header dicts are shared; merge into a new dict, never update them
         request_headers = self.get_auth_headers()
         if headers:
-            request_headers.update(headers)
+            request_headers = {**request_headers, **headers}
+        
+        # Encode JSON bodies ourselves (orjson) rather than via requests' json=
+        body = None
+        if json_data is not None:
+            body = _json_dumps(json_data)
+            request_headers = {"Content-Type": "application/json", **request_headers}
         
         # Start timing
-        start_time = time.time()
-        
-        logger.debug(
-            f"Making {method} request",
-            extra={
-                "url": url,
-                "params": params,
-                "retry_count": _retry_count,
-            }
-        )
+        start_time = time.monotonic()
+        
+        # Per-request logs are gated so disabled levels cost no allocations
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug(
+                "Making %s request",
+                method,
+                extra={
+                    "url": url,
+                    "params": params,
+                }
+            )
         
         try:
             response = self.session.request(
                 method=method,
                 url=url,
                 params=params,
-                json=json_data,
+                data=body,
                 headers=request_headers,
                 timeout=self.timeout,
             )
             
-            # Calculate duration
-            duration_ms = (time.time() - start_time) * 1000
+            # Calculate duration (includes any urllib3 retry sleeps)
+            duration_ms = (time.monotonic() - start_time) * 1000
             
-            # Handle rate limit response specifically
-            if response.status_code == 429:
-                retry_after = int(response.headers.get("Retry-After", 60))
-                self.metrics.record_retry()
-                
-                logger.warning(
-                    f"Rate limited (429), waiting {retry_after}s",
+            # Retries happened inside urllib3; count them from its history
+            retries = getattr(response.raw, "retries", None)
+            retry_count = len(retries.history) if retries else 0
+            
+            # Record successful request metrics
+            with self._metrics_lock:
+                self.metrics.record_request(duration_ms, success=response.ok)
+                self.metrics.record_retry(retry_count)
+            
+            # Log request completion
+            if logger.isEnabledFor(logging.INFO):
+                logger.info(
+                    "API request completed",
                     extra={
-                        "retry_after": retry_after,
-                        "retry_count": _retry_count + 1,
+                        "method": method,
                         "endpoint": endpoint,
+                        "status_code": response.status_code,
                         "duration_ms": round(duration_ms, 2),
+                        "retry_count": retry_count,
+                        # Server-reported size; None for chunked responses.
+                        # Avoids reading the body just to measure it.
+                        "response_size_bytes": response.headers.get("Content-Length"),
                     }
                 )
-                time.sleep(retry_after)
-                return self._make_request(
-                    method, endpoint, params, json_data, headers,
-                    _retry_count=_retry_count + 1
-                )
-            
-            # Record successful request metrics
-            self.metrics.record_request(duration_ms, success=response.ok)
-            
-            # Log request completion
-            logger.info(
-                f"API request completed",
-                extra={
-                    "method": method,
-                    "endpoint": endpoint,
-                    "status_code": response.status_code,
-                    "duration_ms": round(duration_ms, 2),
-                    "retry_count": _retry_count,
-                    "response_size_bytes": len(response.content),
-                }
-            )
             
             response.raise_for_status()
             return response
             
         except requests.exceptions.RequestException as e:
-            duration_ms = (time.time() - start_time) * 1000
-            self.metrics.record_request(duration_ms, success=False)
+            duration_ms = (time.monotonic() - start_time) * 1000
+            with self._metrics_lock:
+                self.metrics.record_request(duration_ms, success=False)
             
             logger.error(
                 f"API request failed",
@@ -240,7 +425,6 @@ class BaseAPIClient(ABC):
                     "endpoint": endpoint,
                     "error": str(e),
                     "duration_ms": round(duration_ms, 2),
-                    "retry_count": _retry_count,
                 }
             )
             raise
@@ -251,9 +435,102 @@ class BaseAPIClient(ABC):
         params: Optional[dict] = None,
         headers: Optional[dict] = None,
     ) -> dict:
-        """Make GET request and return JSON response."""
+        """Make GET request and return JSON response.
+        
+        With cache_ttl_seconds set, a response for the same endpoint and
+        params fetched within the TTL is returned without a request (and
+        without spending a rate limit token). Cached bodies are shared, so
+        callers must not mutate them. Requests with extra headers are never
+        cached.
+        """
+        if not self.cache_ttl_seconds or headers:
+            response = self._make_request("GET", endpoint, params=params, headers=headers)
+            return _json_loads(response.content)
+        
+        key = (endpoint, tuple(sorted((params or {}).items())))
+        with self._response_cache_lock:
+            cached = self._response_cache.get(key)
+            if cached and time.monotonic() - cached[0] < self.cache_ttl_seconds:
+                self._response_cache.move_to_end(key)
+                return cached[1]
+        
+        response = self._make_request("GET", endpoint, params=params)
+        body = _json_loads(response.content)
+        
+        with self._response_cache_lock:
+            self._response_cache[key] = (time.monotonic(), body)
+            self._response_cache.move_to_end(key)
+            if len(self._response_cache) > RESPONSE_CACHE_SIZE:
+                self._response_cache.popitem(last=False)
+        return body
+    
+    def get_with_next_link(
+        self,
+        endpoint: str,
+        params: Optional[dict] = None,
+        headers: Optional[dict] = None,
+    ) -> tuple[dict, Optional[str]]:
+        """Make GET request and return JSON response plus the next-page URL.
+        
+        The next-page URL comes from an RFC 5988 `Link: <...>; rel="next"`
+        header, as parsed by requests into `response.links`.
+        
+        Returns:
+            Tuple of (JSON response, next URL or None if no Link header)
+        """
         response = self._make_request("GET", endpoint, params=params, headers=headers)
-        return response.json()
+        next_url = response.links.get("next", {}).get("url")
+        return _json_loads(response.content), next_url
+    
+    def iter_many(
+        self,
+        endpoint: str,
+        params_list: list[dict],
+        headers: Optional[dict] = None,
+    ) -> Generator[dict, None, None]:
+        """Make concurrent GET requests, yielding responses in order.
+        
+        Requests share the session's connection pool and rate limiter; at
+        most max_concurrency are in flight at once. Each response is yielded
+        as soon as it and those before it have arrived, so the caller can
+        process early pages while later ones are still in flight. Closing
+        the generator early cancels requests that haven't started.
+        
+        Args:
+            endpoint: API endpoint
+            params_list: Query parameters for each request
+            headers: Additional headers applied to every request
+            
+        Yields:
+            JSON responses in the same order as params_list
+        """
+        if not params_list:
+            return
+        
+        workers = min(self.max_concurrency, len(params_list))
+        executor = ThreadPoolExecutor(max_workers=workers)
+        try:
+            yield from executor.map(
+                lambda params: self.get(endpoint, params=params, headers=headers),
+                params_list,
+            )
+        finally:
+            executor.shutdown(cancel_futures=True)
+    
+    def get_many(
+        self,
+        endpoint: str,
+        params_list: list[dict],
+        headers: Optional[dict] = None,
+    ) -> list[dict]:
+        """Make concurrent GET requests, one per params dict.
+        
+        See iter_many(); this collects all responses before returning.
+        
+        Returns:
+            JSON responses in the same order as params_list
+        """
+        return list(self.iter_many(endpoint, params_list, headers=headers))
     
     def post(
         self,
@@ -266,9 +543,20 @@ class BaseAPIClient(ABC):
         response = self._make_request(
             "POST", endpoint, params=params, json_data=json_data, headers=headers
         )
-        return response.json()
+        return _json_loads(response.content)
     
     @abstractmethod
+    def paginate_pages(
+        self,
+        endpoint: str,
+        params: Optional[dict] = None,
+    ) -> Generator[list[dict], None, None]:
+        """Paginate through API results.
+        
+        Yields each page's list of records as returned by the API.
+        """
+        pass
+    
     def paginate(
         self,
         endpoint: str,
@@ -278,7 +566,58 @@ class BaseAPIClient(ABC):
         
         Yields individual records from paginated responses.
         """
-        pass
+        for page in self.paginate_pages(endpoint, params):
+            yield from page
+    
+    def collect_pages(
+        self,
+        endpoint: str,
+        params: Optional[dict] = None,
+    ) -> list[dict]:
+        """Collect all records from paginate_pages() with one extend per page.
+        
+        Args:
+            endpoint: API endpoint
+            params: Query parameters
+            
+        Returns:
+            List of all records
+        """
+        records = []
+        for page in self.paginate_pages(endpoint, params):
+            records.extend(page)
+        return records
+    
+    def collect_arrow(
+        self,
+        endpoint: str,
+        params: Optional[dict] = None,
+    ):
+        """Collect all pages into a pyarrow Table without a list[dict] across pages.
+        
+        Requires pyarrow to be installed. Each page's schema is inferred on
+        its own; pages are then unified (e.g. int -> double, missing columns
+        -> null) when concatenated.
+        
+        Args:
+            endpoint: API endpoint
+            params: Query parameters
+            
+        Returns:
+            pyarrow.Table with one chunk per page
+        """
+        try:
+            import pyarrow as pa
+        except ImportError:
+            raise ImportError("pyarrow is required for Arrow support")
+        
+        tables = [
+            pa.Table.from_pylist(page)
+            for page in self.paginate_pages(endpoint, params)
+        ]
+        if not tables:
+            return pa.table({})
+        return pa.concat_tables(tables, promote_options="permissive")
     
     def extract_all(
         self,
@@ -300,7 +639,7 @@ class BaseAPIClient(ABC):
         if since:
             params["since"] = since
         
-        records = list(self.paginate(endpoint, params))
+        records = self.collect_pages(endpoint, params)
         
         logger.info(
             f"Extracted {len(records)} records",
@@ -8,18 +8,21 @@ Usage:
 
 import argparse
 import logging
+import secrets
 import sys
 import time
-import uuid
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timezone
+from functools import cache
 from typing import Optional
 
 from dotenv import load_dotenv
 
 from src.clients import ApiAClient, ApiBClient
-from src.transform import transform_records
-from src.utils import setup_logging, S3Writer
+from src.transform import make_transformer, transform_table
+from src.utils import setup_logging, ContextAdapter, S3Writer
 from src.utils.pipeline_logger import PipelineLogger, timed_operation
+from src.utils.s3_writer import FILE_FORMATS
 
 # Load environment variables
 load_dotenv()
@@ -27,219 +30,117 @@ load_dotenv()
 logger = logging.getLogger(__name__)
 
 
-def ingest_api_a(
-    batch_id: str,
-    since: Optional[str] = None,
-    s3_writer: Optional[S3Writer] = None,
-) -> dict:
-    """Ingest data from API A.
+# Per-source ingestion settings: client class and transform fields
+SOURCE_CONFIG = {
+    "api_a": {
+        "client": ApiAClient,
+        "timestamp_fields": ("created_at", "updated_at"),
+        "dedupe_sort_field": "updated_at",
+    },
+    "api_b": {
+        "client": ApiBClient,
+        "timestamp_fields": ("created_at", "modified_at"),
+        "dedupe_sort_field": "modified_at",
+    },
+}
+
+
+@cache
+def _shared_writer(file_format: str = "jsonl") -> S3Writer:
+    """Return the process-wide S3Writer for a staging file format.
     
-    Args:
-        batch_id: Unique batch identifier
-        since: Optional ISO timestamp for incremental fetch
-        s3_writer: Optional S3Writer instance
-        
-    Returns:
-        Ingestion result metadata
+    Cached so the boto3 client and its warm connection pool are reused
+    across sources and runs instead of re-handshaking each time.
     """
-    source = "api_a"
-    plog = PipelineLogger(source=source, batch_id=batch_id)
-    plog.start("ingestion")
-    
-    logger.info(
-        "Starting ingestion",
-        extra={
-            "source": source,
-            "batch_id": batch_id,
-            "since": since,
-            "step": "start",
-        }
-    )
-    
-    try:
-        # Fetch from API with timing
-        with timed_operation("api_fetch", logger) as fetch_timer:
-            client = ApiAClient()
-            raw_records = client.fetch(since=since)
-        
-        # Log API request metrics
-        api_metrics = client.metrics.to_dict()
-        logger.info(
-            "API fetch completed",
-            extra={
-                "source": source,
-                "batch_id": batch_id,
-                "step": "api_fetch",
-                "row_count": len(raw_records),
-                "duration_ms": round(fetch_timer.duration_ms, 2),
-                "retry_count": api_metrics["total_retries"],
-                "api_metrics": api_metrics,
-            }
-        )
-        
-        if not raw_records:
-            plog.success("ingestion", row_count=0)
-            return {
-                "source": source,
-                "batch_id": batch_id,
-                "status": "success",
-                "records_fetched": 0,
-                "records_staged": 0,
-                "api_metrics": api_metrics,
-            }
-        
-        # Transform with timing
-        with timed_operation("transform", logger) as transform_timer:
-            valid_records, invalid_records = transform_records(
-                raw_records,
-                required_fields=["id"],
-                timestamp_fields=["created_at", "updated_at"],
-                dedupe_key_fields=["id"],
-                dedupe_sort_field="updated_at",
-                normalize_keys=True,
-            )
-        
-        plog.log_transform(
-            input_count=len(raw_records),
-            output_count=len(valid_records),
-            invalid_count=len(invalid_records),
-            duration_ms=transform_timer.duration_ms,
-        )
-        
-        logger.info(
-            "Transform completed",
-            extra={
-                "source": source,
-                "batch_id": batch_id,
-                "step": "transform",
-                "input_count": len(raw_records),
-                "output_count": len(valid_records),
-                "invalid_count": len(invalid_records),
-                "duration_ms": round(transform_timer.duration_ms, 2),
-            }
-        )
-        
-        # Upload to S3 with timing
-        with timed_operation("s3_upload", logger) as upload_timer:
-            writer = s3_writer or S3Writer()
-            metadata = writer.write(valid_records, source=source, batch_id=batch_id)
-        
-        s3_path = metadata.get("s3_uri")
-        plog.log_s3_upload(
-            s3_path=s3_path,
-            row_count=metadata.get("record_count", 0),
-            file_size_bytes=metadata.get("file_size_bytes", 0),
-            duration_ms=upload_timer.duration_ms,
-        )
-        
-        logger.info(
-            "S3 upload completed",
-            extra={
-                "source": source,
-                "batch_id": batch_id,
-                "step": "s3_upload",
-                "s3_path": s3_path,
-                "row_count": metadata.get("record_count", 0),
-                "file_size_bytes": metadata.get("file_size_bytes", 0),
-                "duration_ms": round(upload_timer.duration_ms, 2),
-            }
-        )
-        
-        result = {
-            "source": source,
-            "batch_id": batch_id,
-            "status": "success",
-            "records_fetched": len(raw_records),
-            "records_valid": len(valid_records),
-            "records_invalid": len(invalid_records),
-            "records_staged": metadata.get("record_count", 0),
-            "s3_uri": s3_path,
-            "s3_path": metadata.get("s3_key"),
-            "file_size_bytes": metadata.get("file_size_bytes"),
-            "api_metrics": api_metrics,
-            "timings": {
-                "api_fetch_ms": round(fetch_timer.duration_ms, 2),
-                "transform_ms": round(transform_timer.duration_ms, 2),
-                "s3_upload_ms": round(upload_timer.duration_ms, 2),
-            },
-        }
-        
-        plog.success("ingestion", row_count=len(valid_records), s3_path=s3_path)
-        logger.info("Ingestion completed successfully", extra=result)
-        return result
-        
-    except Exception as e:
-        plog.error("ingestion", e)
-        logger.error(
-            "Ingestion failed",
-            extra={
-                "source": source,
-                "batch_id": batch_id,
-                "step": "error",
-                "error": str(e),
-                "retry_count": plog._retry_count,
-            },
-            exc_info=True
-        )
-        return {
-            "source": source,
-            "batch_id": batch_id,
-            "status": "error",
-            "error": str(e),
-        }
+    return S3Writer(file_format=file_format)
 
 
-def ingest_api_b(
+def ingest_source(
+    source: str,
     batch_id: str,
     since: Optional[str] = None,
     s3_writer: Optional[S3Writer] = None,
+    vectorize: bool = False,
 ) -> dict:
-    """Ingest data from API B.
+    """Ingest data from one API source: fetch, transform, stage to S3.
     
     Args:
+        source: Source name, a key of SOURCE_CONFIG
         batch_id: Unique batch identifier
         since: Optional ISO timestamp for incremental fetch
-        s3_writer: Optional S3Writer instance
+        s3_writer: Optional S3Writer instance (default: the shared writer)
+        vectorize: Fetch into a pyarrow Table and transform it with
+            columnar kernels (transform_table) instead of per record
         
     Returns:
         Ingestion result metadata
     """
-    source = "api_b"
+    config = SOURCE_CONFIG[source]
     plog = PipelineLogger(source=source, batch_id=batch_id)
     plog.start("ingestion")
+    log = ContextAdapter(logger, {"source": source, "batch_id": batch_id})
     
-    logger.info(
+    log.info(
         "Starting ingestion",
         extra={
-            "source": source,
-            "batch_id": batch_id,
             "since": since,
             "step": "start",
         }
     )
     
     try:
-        # Fetch from API with timing
-        with timed_operation("api_fetch", logger) as fetch_timer:
-            client = ApiBClient()
-            raw_records = client.fetch(since=since)
+        # Fetch and transform in one pass: by default records are normalized,
+        # validated and deduped as pages arrive, so the raw batch is never
+        # held in memory; the vectorized path holds it as one Arrow table.
+        # Either way the timing covers both steps.
+        with timed_operation("api_fetch", logger) as fetch_timer, config["client"]() as client:
+            if vectorize:
+                table = client.fetch_arrow(since=since)
+                raw_count = table.num_rows
+                valid_records, invalid_records = [], []
+                # An empty window may come back with no columns at all
+                if raw_count:
+                    valid_table, invalid_table = transform_table(
+                        table,
+                        required_fields=["id"],
+                        timestamp_fields=config["timestamp_fields"],
+                        dedupe_key_fields=["id"],
+                        dedupe_sort_field=config["dedupe_sort_field"],
+                        normalize_keys=True,
+                    )
+                    valid_records = valid_table.to_pylist()
+                    invalid_records = invalid_table.to_pylist()
+            else:
+                # Cached per source config, so field specs learned on
+                # earlier batches are reused
+                transform = make_transformer(
+                    required_fields=("id",),
+                    timestamp_fields=config["timestamp_fields"],
+                    dedupe_key_fields=("id",),
+                    dedupe_sort_field=config["dedupe_sort_field"],
+                    normalize_keys=True,
+                )
+                transformed = transform(client.iter_records(since=since))
+                raw_count = transformed.input_count
+                valid_records = transformed.valid_records
+                invalid_records = transformed.invalid_records
+        
+        fetch_ms = round(fetch_timer.duration_ms, 2)
         
         # Log API request metrics
         api_metrics = client.metrics.to_dict()
-        logger.info(
+        log.info(
             "API fetch completed",
             extra={
-                "source": source,
-                "batch_id": batch_id,
                 "step": "api_fetch",
-                "row_count": len(raw_records),
-                "duration_ms": round(fetch_timer.duration_ms, 2),
+                "row_count": raw_count,
+                "duration_ms": fetch_ms,
                 "retry_count": api_metrics["total_retries"],
                 "api_metrics": api_metrics,
             }
         )
         
-        if not raw_records:
+        if not raw_count:
             plog.success("ingestion", row_count=0)
             return {
                 "source": source,
@@ -250,42 +151,29 @@ def ingest_api_b(
                 "api_metrics": api_metrics,
             }
         
-        # Transform with timing
-        with timed_operation("transform", logger) as transform_timer:
-            valid_records, invalid_records = transform_records(
-                raw_records,
-                required_fields=["id"],
-                timestamp_fields=["created_at", "modified_at"],
-                dedupe_key_fields=["id"],
-                dedupe_sort_field="modified_at",
-                normalize_keys=True,
-            )
-        
         plog.log_transform(
-            input_count=len(raw_records),
+            input_count=raw_count,
             output_count=len(valid_records),
             invalid_count=len(invalid_records),
-            duration_ms=transform_timer.duration_ms,
+            duration_ms=fetch_timer.duration_ms,
         )
         
-        logger.info(
+        log.info(
             "Transform completed",
             extra={
-                "source": source,
-                "batch_id": batch_id,
                 "step": "transform",
-                "input_count": len(raw_records),
+                "input_count": raw_count,
                 "output_count": len(valid_records),
                 "invalid_count": len(invalid_records),
-                "duration_ms": round(transform_timer.duration_ms, 2),
             }
         )
         
         # Upload to S3 with timing
         with timed_operation("s3_upload", logger) as upload_timer:
-            writer = s3_writer or S3Writer()
+            writer = s3_writer or _shared_writer()
             metadata = writer.write(valid_records, source=source, batch_id=batch_id)
         
+        upload_ms = round(upload_timer.duration_ms, 2)
         s3_path = metadata.get("s3_uri")
         plog.log_s3_upload(
             s3_path=s3_path,
@@ -294,16 +182,14 @@ def ingest_api_b(
             duration_ms=upload_timer.duration_ms,
         )
         
-        logger.info(
+        log.info(
             "S3 upload completed",
             extra={
-                "source": source,
-                "batch_id": batch_id,
                 "step": "s3_upload",
                 "s3_path": s3_path,
                 "row_count": metadata.get("record_count", 0),
                 "file_size_bytes": metadata.get("file_size_bytes", 0),
-                "duration_ms": round(upload_timer.duration_ms, 2),
+                "duration_ms": upload_ms,
             }
         )
         
@@ -311,7 +197,7 @@ def ingest_api_b(
             "source": source,
             "batch_id": batch_id,
             "status": "success",
-            "records_fetched": len(raw_records),
+            "records_fetched": raw_count,
             "records_valid": len(valid_records),
             "records_invalid": len(invalid_records),
             "records_staged": metadata.get("record_count", 0),
@@ -320,23 +206,21 @@ def ingest_api_b(
             "file_size_bytes": metadata.get("file_size_bytes"),
             "api_metrics": api_metrics,
             "timings": {
-                "api_fetch_ms": round(fetch_timer.duration_ms, 2),
-                "transform_ms": round(transform_timer.duration_ms, 2),
-                "s3_upload_ms": round(upload_timer.duration_ms, 2),
+                # Includes the transform, which runs as pages arrive
+                "api_fetch_ms": fetch_ms,
+                "s3_upload_ms": upload_ms,
             },
         }
         
         plog.success("ingestion", row_count=len(valid_records), s3_path=s3_path)
-        logger.info("Ingestion completed successfully", extra=result)
+        log.info("Ingestion completed successfully", extra=result)
         return result
         
     except Exception as e:
         plog.error("ingestion", e)
-        logger.error(
+        log.error(
             "Ingestion failed",
             extra={
-                "source": source,
-                "batch_id": batch_id,
                 "step": "error",
                 "error": str(e),
                 "retry_count": plog._retry_count,
@@ -355,24 +239,31 @@ def run_ingestion(
     sources: Optional[list[str]] = None,
     since: Optional[str] = None,
     batch_id: Optional[str] = None,
+    file_format: str = "jsonl",
+    vectorize: bool = False,
 ) -> dict:
     """Run ingestion for specified sources.
     
+    Sources are independent and I/O-bound, so they run concurrently; wall
+    time is that of the slowest source rather than the sum.
+    
     Args:
         sources: List of sources to ingest (default: all)
         since: Optional ISO timestamp for incremental fetch
         batch_id: Optional batch ID (auto-generated if not provided)
+        file_format: Staging file format, "jsonl", "jsonl.gz" or "parquet"
+        vectorize: Use the columnar pyarrow transform (see ingest_source)
         
     Returns:
         Combined results for all sources
     """
     # Generate batch ID
     if batch_id is None:
-        batch_id = uuid.uuid4().hex[:12]
+        batch_id = secrets.token_hex(6)
     
     # Default to all sources
     if sources is None:
-        sources = ["api_a", "api_b"]
+        sources = list(SOURCE_CONFIG)
     
     start_time = datetime.now(timezone.utc)
     
@@ -385,17 +276,36 @@ def run_ingestion(
         }
     )
     
-    # Create shared S3 writer
-    s3_writer = S3Writer()
-    
-    # Run ingestion for each source
-    results = {}
-    
-    if "api_a" in sources:
-        results["api_a"] = ingest_api_a(batch_id, since, s3_writer)
+    # Shared S3 writer (boto3 clients are thread-safe), reused across runs
+    s3_writer = _shared_writer(file_format)
     
-    if "api_b" in sources:
-        results["api_b"] = ingest_api_b(batch_id, since, s3_writer)
+    # Run ingestion for each source in parallel
+    selected = [source for source in sources if source in SOURCE_CONFIG]
+    with ThreadPoolExecutor(max_workers=max(len(selected), 1)) as executor:
+        futures = {
+            source: executor.submit(
+                ingest_source, source, batch_id, since, s3_writer, vectorize
+            )
+            for source in selected
+        }
+        results = {}
+        for source, future in futures.items():
+            # ingest_source reports its own failures; this only guards
+            # against one escaping, so the other sources' results survive
+            try:
+                results[source] = future.result()
+            except Exception as e:
+                logger.error(
+                    "Ingestion crashed",
+                    extra={"source": source, "batch_id": batch_id, "error": str(e)},
+                    exc_info=True,
+                )
+                results[source] = {
+                    "source": source,
+                    "batch_id": batch_id,
+                    "status": "error",
+                    "error": str(e),
+                }
     
     end_time = datetime.now(timezone.utc)
     duration_seconds = (end_time - start_time).total_seconds()
@@ -432,7 +342,7 @@ def main():
     )
     parser.add_argument(
         "--source",
-        choices=["api_a", "api_b", "all"],
+        choices=[*SOURCE_CONFIG, "all"],
         default="all",
         help="Source to ingest (default: all)",
     )
@@ -448,6 +358,19 @@ def main():
         default=None,
         help="Batch ID (auto-generated if not provided)",
     )
+    parser.add_argument(
+        "--format",
+        choices=list(FILE_FORMATS),
+        default="jsonl",
+        help="Staging file format (default: jsonl; jsonl.gz is gzipped; "
+             "parquet needs a Parquet file format on the Snowpipes)",
+    )
+    parser.add_argument(
+        "--vectorize",
+        action="store_true",
+        help="Transform with pyarrow compute kernels instead of per record "
+             "(requires pyarrow; nested fields are not normalized)",
+    )
     parser.add_argument(
         "--log-level",
         choices=["DEBUG", "INFO", "WARNING", "ERROR"],
@@ -468,6 +391,8 @@ def main():
         sources=sources,
         since=args.since,
         batch_id=args.batch_id,
+        file_format=args.format,
+        vectorize=args.vectorize,
     )
     
     # Exit with error code if any failures
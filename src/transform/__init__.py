@@ -8,15 +8,24 @@ Handles:
 - Deduplication
 """
 
-from .flatten import flatten_json, flatten_records
+from .flatten import flatten_json, flatten_records, flatten_records_specialized
 from .normalize import (
     normalize_timestamp,
     normalize_record,
     validate_required_fields,
     validate_records,
+    validate_records_soa,
     dedupe_records,
+    dedupe_records_iter,
     dedupe_by_id_updated,
     transform_records,
+    transform_records_soa,
+    transform_records_parallel,
+    transform_record_stream,
+    records_to_columns,
+    make_transformer,
+    transform_table,
+    TransformResult,
     ValidationResult,
     ValidationError,
 )
@@ -25,18 +34,28 @@ __all__ = [
     # Flattening
     "flatten_json",
     "flatten_records",
+    "flatten_records_specialized",
     # Normalization
     "normalize_timestamp",
     "normalize_record",
     # Validation
     "validate_required_fields",
     "validate_records",
+    "validate_records_soa",
     "ValidationResult",
     "ValidationError",
     # Deduplication
     "dedupe_records",
+    "dedupe_records_iter",
     "dedupe_by_id_updated",
     # Full pipeline
     "transform_records",
+    "transform_records_soa",
+    "transform_records_parallel",
+    "transform_record_stream",
+    "records_to_columns",
+    "make_transformer",
+    "transform_table",
+    "TransformResult",
 ]
 
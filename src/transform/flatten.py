@@ -1,10 +1,29 @@
 """JSON flattening utilities."""
 
 import logging
-from typing import Any
+import sys
+from typing import Any, Callable, Optional
 
 logger = logging.getLogger(__name__)
 
+# (prefix, separator, key) -> interned flattened key. Every record of a
+# source shares the same nested paths, so records reuse one str per path
+# instead of formatting a new one each time. Cleared when it grows past
+# the limit (e.g. payloads that use IDs as keys).
+_KEY_CACHE: dict[tuple[str, str, str], str] = {}
+KEY_CACHE_SIZE = 65536
+
+
+def _join_key(prefix: str, separator: str, key: str) -> str:
+    """Build (or reuse) the flattened key for a nested field."""
+    cache_key = (prefix, separator, key)
+    joined = _KEY_CACHE.get(cache_key)
+    if joined is None:
+        if len(_KEY_CACHE) >= KEY_CACHE_SIZE:
+            _KEY_CACHE.clear()
+        joined = _KEY_CACHE[cache_key] = sys.intern(f"{prefix}{separator}{key}")
+    return joined
+
 
 def flatten_json(
     nested_dict: dict,
@@ -27,27 +46,27 @@ def flatten_json(
         >>> flatten_json({"a": {"b": 1, "c": {"d": 2}}})
         {"a_b": 1, "a_c_d": 2}
     """
-    items: list[tuple[str, Any]] = []
+    # Iterative DFS writing straight into one output dict: no recursion and
+    # no per-level temporary dicts. Each stack entry holds a live iterator so
+    # keys come out in the same order as the recursive version produced.
+    flat: dict[str, Any] = {}
+    stack = [(parent_key, iter(nested_dict.items()), max_depth)]
     
-    for key, value in nested_dict.items():
-        new_key = f"{parent_key}{separator}{key}" if parent_key else key
-        
-        if isinstance(value, dict) and max_depth > 0:
-            items.extend(
-                flatten_json(
-                    value,
-                    parent_key=new_key,
-                    separator=separator,
-                    max_depth=max_depth - 1,
-                ).items()
-            )
-        elif isinstance(value, list):
-            # Keep lists as-is (they'll be stored as arrays in Snowflake)
-            items.append((new_key, value))
+    while stack:
+        prefix, items, depth = stack[-1]
+        for key, value in items:
+            new_key = _join_key(prefix, separator, key) if prefix else key
+            
+            if depth > 0 and isinstance(value, dict):
+                # Descend now; this level resumes from its iterator later
+                stack.append((new_key, iter(value.items()), depth - 1))
+                break
+            # Lists are kept as-is (they'll be stored as arrays in Snowflake)
+            flat[new_key] = value
         else:
-            items.append((new_key, value))
+            stack.pop()
     
-    return dict(items)
+    return flat
 
 
 def flatten_records(
@@ -65,13 +84,12 @@ def flatten_records(
     Returns:
         List of flattened dictionaries
     """
-    flattened = []
+    # Output size is known exactly, so fill a presized list in place
+    flattened: list = [None] * len(records)
     
     for i, record in enumerate(records):
         try:
-            flattened.append(
-                flatten_json(record, separator=separator, max_depth=max_depth)
-            )
+            flattened[i] = flatten_json(record, separator=separator, max_depth=max_depth)
         except Exception as e:
             logger.error(
                 f"Error flattening record at index {i}: {e}",
@@ -82,3 +100,106 @@ def flatten_records(
     logger.debug(f"Flattened {len(flattened)} records")
     return flattened
 
+
+def _compile_flattener(
+    record: dict,
+    separator: str,
+    max_depth: int,
+) -> Optional[Callable[[dict], Optional[dict]]]:
+    """Generate a flattener specialized to the shape of one record.
+    
+    The generated function indexes each nested path directly instead of
+    walking the record. It first checks that a record has exactly the
+    same shape (same keys in the same order at every level, nested values
+    still plain dicts, leaves still non-dicts) and returns None when it
+    does not. Returns None when the record cannot be specialized (non-str
+    keys or dict subclasses).
+    
+    Code is generated in the same depth-first document order flatten_json
+    walks, so the returned dict literal has the same key order and, when
+    flattened keys collide, the same value wins (the later one, at the
+    first one's position).
+    """
+    lines = [f"    if tuple(r) != {tuple(record)!r}: return None"]
+    entries = []
+    counter = 0
+    # Same iterator stack as flatten_json:
+    # (source expression, flattened key prefix, items iterator, remaining depth)
+    stack = [("r", "", iter(record.items()), max_depth)]
+    
+    while stack:
+        expr, prefix, items, depth = stack[-1]
+        for key, value in items:
+            if type(key) is not str:
+                return None
+            counter += 1
+            name = f"v{counter}"
+            flat_key = _join_key(prefix, separator, key) if prefix else key
+            lines.append(f"    {name} = {expr}[{key!r}]")
+            
+            if depth > 0 and isinstance(value, dict):
+                if type(value) is not dict or any(type(k) is not str for k in value):
+                    return None
+                lines.append(
+                    f"    if type({name}) is not dict or tuple({name}) != {tuple(value)!r}: return None"
+                )
+                # Descend now; this level resumes from its iterator later
+                stack.append((name, flat_key, iter(value.items()), depth - 1))
+                break
+            
+            if depth > 0:
+                lines.append(f"    if isinstance({name}, dict): return None")
+            entries.append(f"{flat_key!r}: {name}")
+        else:
+            stack.pop()
+    
+    source = "def _flatten(r):\n" + "\n".join(lines) + "\n    return {" + ", ".join(entries) + "}\n"
+    namespace: dict = {}
+    # Safe: the source is built only from repr()'d str keys and generated names
+    exec(source, namespace)  # noqa: S102
+    return namespace["_flatten"]
+
+
+def flatten_records_specialized(
+    records: list[dict],
+    separator: str = "_",
+    max_depth: int = 10,
+) -> list[dict]:
+    """Flatten a homogeneous batch with a flattener generated for its shape.
+    
+    Same result as flatten_records, including key order. The first
+    record's shape is compiled into straight-line indexing code (see
+    _compile_flattener), so records with that shape skip the per-level
+    walk; records that differ in keys, key order or nesting fall back to
+    flatten_json.
+    
+    Args:
+        records: List of nested dictionaries, typically sharing one schema
+        separator: Separator between nested key levels
+        max_depth: Maximum nesting depth to flatten
+        
+    Returns:
+        List of flattened dictionaries
+    """
+    if not records:
+        return []
+    
+    flatten_one = _compile_flattener(records[0], separator, max_depth)
+    if flatten_one is None:
+        return flatten_records(records, separator=separator, max_depth=max_depth)
+    
+    flattened: list = [None] * len(records)
+    fallback_count = 0
+    
+    for i, record in enumerate(records):
+        flat = flatten_one(record)
+        if flat is None:
+            fallback_count += 1
+            flat = flatten_json(record, separator=separator, max_depth=max_depth)
+        flattened[i] = flat
+    
+    logger.debug(
+        f"Flattened {len(flattened)} records",
+        extra={"fallback_count": fallback_count}
+    )
+    return flattened
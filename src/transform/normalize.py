@@ -1,28 +1,39 @@
 """Data normalization, validation, and deduplication utilities."""
 
 import logging
-import re
-from dataclasses import dataclass, field
+import string
+import sys
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
 from datetime import datetime, timezone
-from typing import Any, Optional
+from functools import lru_cache
+from typing import Any, Callable, Iterable, Iterator, NamedTuple, Optional, Sequence
 
 from src.transform.flatten import flatten_json
 
 logger = logging.getLogger(__name__)
 
-# Common timestamp formats to try parsing
+# ISO 8601 strings (the API A/B format) go through datetime.fromisoformat;
+# these are the non-ISO layouts tried, in order, when that fails
 TIMESTAMP_FORMATS = [
-    "%Y-%m-%dT%H:%M:%S.%fZ",
-    "%Y-%m-%dT%H:%M:%SZ",
-    "%Y-%m-%dT%H:%M:%S.%f%z",
-    "%Y-%m-%dT%H:%M:%S%z",
-    "%Y-%m-%d %H:%M:%S.%f",
-    "%Y-%m-%d %H:%M:%S",
-    "%Y-%m-%d",
     "%d/%m/%Y %H:%M:%S",
     "%m/%d/%Y %H:%M:%S",
 ]
 
+# Unix seconds datetime can represent (0001-01-01 to 9999-12-31 UTC)
+_MIN_EPOCH_SECONDS = -62135596800
+_MAX_EPOCH_SECONDS = 253402300799
+
+# Character classes for normalize_key: one table lookup per character.
+# Anything not in the table is dropped (or is a separator if whitespace).
+_UPPER, _LOWER, _DIGIT, _SEP = 1, 2, 3, 4
+_KEY_CHAR_KIND = {
+    **dict.fromkeys(string.ascii_uppercase, _UPPER),
+    **dict.fromkeys(string.ascii_lowercase, _LOWER),
+    **dict.fromkeys(string.digits, _DIGIT),
+    **dict.fromkeys("_-" + string.whitespace, _SEP),
+}
+
 
 def normalize_timestamp(
     value: Any,
@@ -50,24 +61,41 @@ def normalize_timestamp(
         # Check if milliseconds (> year 3000 in seconds)
         if value > 32503680000:
             value = value / 1000
+        # Range check (years 1-9999) instead of catching fromtimestamp's
+        # OverflowError/ValueError; NaN fails it too
+        if not _MIN_EPOCH_SECONDS <= value <= _MAX_EPOCH_SECONDS:
+            logger.warning(f"Could not parse timestamp: {value}")
+            return None
         dt = datetime.fromtimestamp(value, tz=timezone.utc)
         return dt.strftime(output_format)
     
     if isinstance(value, str):
-        # Try each format
+        return _parse_timestamp_str(value, output_format)
+    
+    return None
+
+
+@lru_cache(maxsize=65536)
+def _parse_timestamp_str(value: str, output_format: str) -> Optional[str]:
+    """Parse a timestamp string and render it in output_format (cached)."""
+    try:
+        # One C-level parse covers every ISO variant (Z/offset, T/space,
+        # fractional seconds, date-only) without probing formats
+        dt = datetime.fromisoformat(value)
+    except ValueError:
         for fmt in TIMESTAMP_FORMATS:
             try:
                 dt = datetime.strptime(value, fmt)
-                if dt.tzinfo is None:
-                    dt = dt.replace(tzinfo=timezone.utc)
-                return dt.strftime(output_format)
+                break
             except ValueError:
                 continue
-        
-        logger.warning(f"Could not parse timestamp: {value}")
-        return None
+        else:
+            logger.warning(f"Could not parse timestamp: {value}")
+            return None
     
-    return None
+    if dt.tzinfo is None:
+        dt = dt.replace(tzinfo=timezone.utc)
+    return dt.strftime(output_format)
 
 
 def normalize_string(value: Any) -> Optional[str]:
@@ -82,67 +110,101 @@ def normalize_string(value: Any) -> Optional[str]:
     return str(value)
 
 
+@lru_cache(maxsize=4096)
 def normalize_key(key: str) -> str:
     """Normalize a key name for consistency.
     
-    Converts to snake_case, removes special characters.
+    Converts to snake_case, removes special characters. Acronyms stay
+    together ("someAPIKey" -> "some_api_key"). Cached and interned, since
+    every record of a source repeats the same few dozen field names.
     """
-    # Replace hyphens and spaces with underscores
-    key = re.sub(r"[-\s]+", "_", key)
-    # Remove non-alphanumeric characters (except underscore)
-    key = re.sub(r"[^a-zA-Z0-9_]", "", key)
-    # Convert camelCase to snake_case
-    key = re.sub(r"([a-z0-9])([A-Z])", r"\1_\2", key)
-    # Lowercase and remove duplicate underscores
-    key = re.sub(r"_+", "_", key.lower())
-    # Remove leading/trailing underscores
-    return key.strip("_")
+    # Single pass over the kept characters: hyphens, spaces and underscores
+    # collapse into one underscore, anything else non-alphanumeric is
+    # dropped, and an underscore goes before an uppercase letter that
+    # follows a lowercase letter/digit or starts a word after an acronym
+    kept = []
+    for char in key:
+        kind = _KEY_CHAR_KIND.get(char)
+        if kind is None:
+            if not char.isspace():
+                continue
+            kind = _SEP
+        kept.append((char, kind))
+    
+    out = []
+    prev = _SEP
+    last = len(kept) - 1
+    for i, (char, kind) in enumerate(kept):
+        if kind == _SEP:
+            if prev != _SEP:
+                out.append("_")
+        elif kind == _UPPER:
+            if prev == _LOWER or prev == _DIGIT or (
+                prev == _UPPER and i < last and kept[i + 1][1] == _LOWER
+            ):
+                out.append("_")
+            out.append(char.lower())
+        else:
+            out.append(char)
+        prev = kind
+    
+    # Interned so every record shares one str object per column name
+    return sys.intern("".join(out).strip("_"))
 
 
 def normalize_record(
     record: dict,
-    timestamp_fields: Optional[list[str]] = None,
+    timestamp_fields: Optional[Iterable[str]] = None,
     normalize_keys: bool = True,
 ) -> dict:
     """Normalize a data record.
     
+    Nested dicts (including dicts inside lists) are normalized too, using
+    an explicit stack rather than recursion.
+    
     Args:
         record: The record to normalize
-        timestamp_fields: List of field names to treat as timestamps
+        timestamp_fields: Field names to treat as timestamps
         normalize_keys: Whether to normalize key names to snake_case
         
     Returns:
         Normalized record
     """
-    timestamp_fields = timestamp_fields or []
-    normalized = {}
+    timestamp_fields = frozenset(timestamp_fields or ())
+    normalized: dict = {}
+    # (source dict, output dict) pairs; outputs are already linked into
+    # their parent, so filling them in later keeps key order intact
+    stack = [(record, normalized)]
     
-    for key, value in record.items():
-        # Normalize key if requested
-        new_key = normalize_key(key) if normalize_keys else key
-        
-        # Normalize timestamp fields
-        if key in timestamp_fields or new_key in timestamp_fields:
-            normalized[new_key] = normalize_timestamp(value)
-        elif isinstance(value, str):
-            normalized[new_key] = normalize_string(value)
-        elif isinstance(value, dict):
-            # Recursively normalize nested dicts
-            normalized[new_key] = normalize_record(
-                value,
-                timestamp_fields=timestamp_fields,
-                normalize_keys=normalize_keys,
-            )
-        elif isinstance(value, list):
-            # Normalize list items if they're dicts
-            normalized[new_key] = [
-                normalize_record(item, timestamp_fields, normalize_keys)
-                if isinstance(item, dict)
-                else item
-                for item in value
-            ]
-        else:
-            normalized[new_key] = value
+    while stack:
+        source, out = stack.pop()
+        for key, value in source.items():
+            # Normalize key if requested
+            new_key = normalize_key(key) if normalize_keys else key
+            value_type = type(value)
+            
+            # Normalize timestamp fields
+            if timestamp_fields and (key in timestamp_fields or new_key in timestamp_fields):
+                out[new_key] = normalize_timestamp(value)
+            elif value_type is str:
+                out[new_key] = value.strip()
+            elif value_type is dict:
+                child: dict = {}
+                out[new_key] = child
+                stack.append((value, child))
+            elif value_type is list:
+                # Normalize list items if they're dicts
+                items = []
+                for item in value:
+                    if type(item) is dict:
+                        child = {}
+                        stack.append((item, child))
+                        items.append(child)
+                    else:
+                        items.append(item)
+                out[new_key] = items
+            else:
+                out[new_key] = value
     
     return normalized
 
@@ -151,15 +213,22 @@ def normalize_record(
 # Validation
 # ============================================
 
-@dataclass
-class ValidationResult:
-    """Result of record validation."""
+class ValidationResult(NamedTuple):
+    """Result of record validation.
+    
+    A NamedTuple rather than a dataclass: one is built per validated
+    record, and tuple construction is much cheaper than dataclass __init__.
+    """
     
     is_valid: bool
-    errors: list[str] = field(default_factory=list)
+    errors: Sequence[str] = ()
     record: Optional[dict] = None
 
 
+# Sentinel telling a missing field apart from an explicit null
+_MISSING = object()
+
+
 class ValidationError(Exception):
     """Raised when validation fails."""
     
@@ -171,12 +240,15 @@ class ValidationError(Exception):
 def validate_required_fields(
     record: dict,
     required_fields: list[str],
+    fail_fast: bool = False,
 ) -> ValidationResult:
     """Validate that required fields are present and not null.
     
     Args:
         record: The record to validate
         required_fields: List of required field names
+        fail_fast: Stop at the first failing field (errors then holds
+            only that one)
         
     Returns:
         ValidationResult with is_valid flag and any errors
@@ -184,57 +256,110 @@ def validate_required_fields(
     errors = []
     
     for field_name in required_fields:
-        if field_name not in record:
+        value = record.get(field_name, _MISSING)
+        if value is _MISSING:
             errors.append(f"Missing required field: {field_name}")
-        elif record[field_name] is None:
+        elif value is None:
             errors.append(f"Null value for required field: {field_name}")
-        elif isinstance(record[field_name], str) and not record[field_name].strip():
+        elif type(value) is str and not value.strip():
             errors.append(f"Empty value for required field: {field_name}")
+        else:
+            continue
+        if fail_fast:
+            break
     
-    return ValidationResult(
-        is_valid=len(errors) == 0,
-        errors=errors,
-        record=record if len(errors) == 0 else None,
-    )
+    if errors:
+        return ValidationResult(False, errors, None)
+    return ValidationResult(True, errors, record)
+
+
+def _has_required_fields(record: dict, required_fields: Iterable[str]) -> bool:
+    """Fast check that every required field is present, non-null, non-blank.
+    
+    Agrees with validate_required_fields(...).is_valid but builds no error
+    list, so the common all-valid path allocates nothing; callers only run
+    the full validation for records that fail here.
+    """
+    get = record.get
+    for field_name in required_fields:
+        value = get(field_name)
+        if value is None or (type(value) is str and not value.strip()):
+            return False
+    return True
+
+
+def validate_records_soa(
+    columns: dict[str, list],
+    required_fields: Iterable[str],
+) -> list[bool]:
+    """Validate columnar records (as from records_to_columns).
+    
+    Same rule as validate_required_fields, applied a column at a time:
+    one comprehension per required field instead of a function call per
+    record. A field with no column fails every row.
+    
+    Args:
+        columns: Mapping of field name to equal-length value lists
+        required_fields: Required field names
+        
+    Returns:
+        Per-row validity mask; select rows with itertools.compress
+    """
+    row_count = len(next(iter(columns.values()), ()))
+    mask = [True] * row_count
+    
+    for field_name in required_fields:
+        column = columns.get(field_name)
+        if column is None:
+            return [False] * row_count
+        mask = [
+            ok and value is not None and not (type(value) is str and not value.strip())
+            for ok, value in zip(mask, column)
+        ]
+    
+    return mask
 
 
 def validate_records(
-    records: list[dict],
+    records: Iterable[dict],
     required_fields: list[str],
     raise_on_error: bool = False,
 ) -> tuple[list[dict], list[dict]]:
     """Validate a list of records.
     
     Args:
-        records: List of records to validate
+        records: Records to validate (a list or any iterable, consumed once)
         required_fields: List of required field names
         raise_on_error: If True, raise exception on first error
         
     Returns:
-        Tuple of (valid_records, invalid_records)
+        Tuple of (valid_records, invalid_records). Each invalid entry is
+        {"_validation_errors", "_record_index", "record"}, where record is
+        the original dict (not a copy).
         
     Raises:
         ValidationError: If raise_on_error=True and validation fails
     """
     valid_records = []
     invalid_records = []
+    required_fields = tuple(required_fields)
     
     for i, record in enumerate(records):
-        result = validate_required_fields(record, required_fields)
-        
-        if result.is_valid:
+        if _has_required_fields(record, required_fields):
             valid_records.append(record)
         else:
+            result = validate_required_fields(
+                record, required_fields, fail_fast=raise_on_error
+            )
             if raise_on_error:
                 raise ValidationError(result.errors)
             
-            # Add error info to invalid record
-            invalid_record = {
+            # Reference the record rather than copying it into the entry
+            invalid_records.append({
                 "_validation_errors": result.errors,
                 "_record_index": i,
-                **record,
-            }
-            invalid_records.append(invalid_record)
+                "record": record,
+            })
             
             logger.warning(
                 f"Validation failed for record {i}",
@@ -256,6 +381,87 @@ def validate_records(
 # Deduplication
 # ============================================
 
+def _iter_keyed(
+    records: Iterable[dict],
+    key_fields: list[str],
+) -> Iterator[tuple[Any, dict]]:
+    """Yield (dedupe key, record) pairs, skipping records with a null key."""
+    if len(key_fields) == 1:
+        # Common case (dedupe_by_id_updated): use the scalar key directly
+        # instead of building and None-scanning a 1-tuple per record
+        key_field = key_fields[0]
+        for record in records:
+            key = record.get(key_field)
+            if key is None:
+                logger.warning(
+                    "Skipping record with null key field",
+                    extra={"key_fields": key_fields, "key_values": (key,)}
+                )
+                continue
+            yield key, record
+        return
+    
+    for record in records:
+        # Build composite key
+        key_values = tuple(record.get(f) for f in key_fields)
+        
+        # Skip if any key field is None
+        if None in key_values:
+            logger.warning(
+                f"Skipping record with null key field",
+                extra={"key_fields": key_fields, "key_values": key_values}
+            )
+            continue
+        yield key_values, record
+
+
+def dedupe_records_iter(
+    records: Iterable[dict],
+    key_fields: list[str],
+    sort_field: Optional[str] = None,
+    keep: str = "last",
+) -> Iterator[dict]:
+    """Yield deduplicated records without building the output list.
+    
+    Same selection and order as dedupe_records. Without a sort_field,
+    records are yielded as soon as their key is first seen, so any
+    iterable streams through holding only the seen keys; with one, the
+    best record per key is only known once the input is exhausted.
+    
+    Args:
+        records: Records to deduplicate (any iterable, consumed once)
+        key_fields: Fields that form the unique key
+        sort_field: Optional field deciding which duplicate to keep
+        keep: Which duplicate to keep - "first" or "last"
+        
+    Yields:
+        Deduplicated records
+    """
+    keyed = _iter_keyed(records, key_fields)
+    
+    if sort_field:
+        # Track the best record per key rather than sorting the whole batch
+        best: dict = {}
+        keep_last = keep == "last"
+        for key, record in keyed:
+            current = best.get(key)
+            if current is None:
+                best[key] = record
+                continue
+            value = record.get(sort_field) or ""
+            current_value = current.get(sort_field) or ""
+            if (value > current_value) if keep_last else (value < current_value):
+                best[key] = record
+        yield from best.values()
+    else:
+        seen: set = set()
+        seen_add = seen.add
+        for key, record in keyed:
+            if key not in seen:
+                seen_add(key)
+                yield record
+
+
 def dedupe_records(
     records: list[dict],
     key_fields: list[str],
@@ -264,10 +470,19 @@ def dedupe_records(
 ) -> list[dict]:
     """Deduplicate records by composite key.
     
+    Runs in a single pass without sorting: with a sort_field the record
+    with the highest ("last") or lowest ("first") sort value is kept per
+    key, ties going to the earliest record; without one the first record
+    seen per key is kept. Results are in first-seen order of their key.
+    
+    Sort values are compared as-is, with no datetime parsing: timestamps
+    must be ISO 8601 strings in one consistent form (as produced by
+    normalize_timestamp), which order correctly as plain strings.
+    
     Args:
         records: List of records to deduplicate
         key_fields: Fields that form the unique key (e.g., ["id", "updated_at"])
-        sort_field: Optional field to sort by before deduping
+        sort_field: Optional field deciding which duplicate to keep
         keep: Which duplicate to keep - "first" or "last"
         
     Returns:
@@ -284,36 +499,7 @@ def dedupe_records(
     if not records:
         return []
     
-    # Sort if sort_field provided
-    if sort_field:
-        records = sorted(
-            records,
-            key=lambda r: r.get(sort_field) or "",
-            reverse=(keep == "last"),
-        )
-    
-    seen = {}
-    deduped = []
-    
-    for record in records:
-        # Build composite key
-        key_values = tuple(record.get(f) for f in key_fields)
-        
-        # Skip if any key field is None
-        if None in key_values:
-            logger.warning(
-                f"Skipping record with null key field",
-                extra={"key_fields": key_fields, "key_values": key_values}
-            )
-            continue
-        
-        if key_values not in seen:
-            seen[key_values] = True
-            deduped.append(record)
-    
-    # Reverse back if we sorted for "last"
-    if sort_field and keep == "last":
-        deduped = list(reversed(deduped))
+    deduped = list(dedupe_records_iter(records, key_fields, sort_field, keep))
     
     duplicate_count = len(records) - len(deduped)
     if duplicate_count > 0:
@@ -371,6 +557,9 @@ def transform_records(
 ) -> tuple[list[dict], list[dict]]:
     """Full transformation pipeline: normalize → validate → dedupe.
     
+    Runs as a single fused pass; list-returning wrapper around
+    transform_record_stream.
+    
     Args:
         records: Raw records to transform
         required_fields: Fields required for validation
@@ -393,45 +582,469 @@ def transform_records(
         ...     flatten=True,
         ... )
     """
-    required_fields = required_fields or []
-    timestamp_fields = timestamp_fields or []
+    # All four steps run fused, one record at a time: each raw record is
+    # touched once and only survivors (and invalid records) are kept
+    result = transform_record_stream(
+        records,
+        required_fields=required_fields,
+        timestamp_fields=timestamp_fields,
+        dedupe_key_fields=dedupe_key_fields,
+        dedupe_sort_field=dedupe_sort_field,
+        flatten=flatten,
+        normalize_keys=normalize_keys,
+    )
+    return result.valid_records, result.invalid_records
+
+
+def records_to_columns(records: Sequence[dict]) -> dict[str, list]:
+    """Pivot records (list of dicts) into columns (dict of lists).
     
-    # Step 1: Flatten if requested
-    if flatten:
-        records = [flatten_json(r) for r in records]
-        logger.debug(f"Flattened {len(records)} records")
-    
-    # Step 2: Normalize records
-    normalized = [
-        normalize_record(r, timestamp_fields=timestamp_fields, normalize_keys=normalize_keys)
-        for r in records
-    ]
-    logger.debug(f"Normalized {len(normalized)} records")
-    
-    # Step 3: Validate required fields
-    if required_fields:
-        valid_records, invalid_records = validate_records(normalized, required_fields)
-    else:
-        valid_records = normalized
-        invalid_records = []
+    Columns appear in first-seen key order and each holds one value per
+    record, with None where a record lacks the field.
+    """
+    row_count = len(records)
+    columns: dict[str, list] = {}
+    for i, record in enumerate(records):
+        for key, value in record.items():
+            column = columns.get(key)
+            if column is None:
+                # Presized, so records missing the field keep None
+                column = columns[key] = [None] * row_count
+            column[i] = value
+    return columns
+
+
+def transform_records_soa(
+    records: Iterable[dict],
+    required_fields: Optional[list[str]] = None,
+    timestamp_fields: Optional[list[str]] = None,
+    dedupe_key_fields: Optional[list[str]] = None,
+    dedupe_sort_field: Optional[str] = None,
+    flatten: bool = False,
+    normalize_keys: bool = True,
+) -> tuple[dict[str, list], list[dict]]:
+    """transform_records, with the valid records returned as columns.
+    
+    For consumers that scan a few fields across the whole batch: each
+    column is a plain list, so reading one field no longer goes through a
+    dict lookup per record.
+    
+    Args:
+        records: Raw records to transform
+        required_fields: Fields required for validation
+        timestamp_fields: Fields to normalize as timestamps
+        dedupe_key_fields: Fields for deduplication key
+        dedupe_sort_field: Field to sort by for deduplication
+        flatten: Whether to flatten nested JSON
+        normalize_keys: Whether to convert keys to snake_case
+        
+    Returns:
+        Tuple of (valid columns as {field: values}, invalid_records)
+    """
+    result = transform_record_stream(
+        records,
+        required_fields=required_fields,
+        timestamp_fields=timestamp_fields,
+        dedupe_key_fields=dedupe_key_fields,
+        dedupe_sort_field=dedupe_sort_field,
+        flatten=flatten,
+        normalize_keys=normalize_keys,
+    )
+    return records_to_columns(result.valid_records), result.invalid_records
+
+
+@dataclass
+class TransformResult:
+    """Result of transform_record_stream."""
+    
+    valid_records: list[dict]
+    invalid_records: list[dict]
+    input_count: int = 0
+
+
+# Top-level field specs cached per transformer before the table is reset
+FIELD_SPEC_CACHE_SIZE = 4096
+
+
+@lru_cache(maxsize=32)
+def make_transformer(
+    required_fields: tuple[str, ...] = (),
+    timestamp_fields: tuple[str, ...] = (),
+    dedupe_key_fields: tuple[str, ...] = (),
+    dedupe_sort_field: Optional[str] = None,
+    flatten: bool = False,
+    normalize_keys: bool = True,
+) -> Callable[[Iterable[dict]], TransformResult]:
+    """Build (or reuse) a transform specialized for one configuration.
+    
+    Each source transforms every batch with the same fields, so the
+    configuration is resolved once here instead of per record: the
+    returned function keeps a table of top-level field name -> (normalized
+    name, is-timestamp), filled the first time each field is seen, so the
+    hot loop does one dict lookup per field instead of normalizing the key
+    and checking it against timestamp_fields. Transformers are cached per
+    configuration (arguments must be hashable, hence tuples).
+    
+    Args:
+        required_fields: Fields required for validation
+        timestamp_fields: Fields to normalize as timestamps
+        dedupe_key_fields: Fields for deduplication key
+        dedupe_sort_field: Field deciding which duplicate is newest
+        flatten: Whether to flatten nested JSON
+        normalize_keys: Whether to convert keys to snake_case
+        
+    Returns:
+        Function taking an iterable of raw records and returning a
+        TransformResult (see transform_record_stream)
+    """
+    timestamp_set = frozenset(timestamp_fields)
+    field_specs: dict[str, tuple[str, bool]] = {}
+    
+    def normalize(raw: dict) -> dict:
+        record = {}
+        for key, value in raw.items():
+            spec = field_specs.get(key)
+            if spec is None:
+                if len(field_specs) >= FIELD_SPEC_CACHE_SIZE:
+                    field_specs.clear()
+                new_key = normalize_key(key) if normalize_keys else key
+                spec = field_specs[key] = (
+                    new_key, key in timestamp_set or new_key in timestamp_set
+                )
+            new_key, is_timestamp = spec
+            
+            value_type = type(value)
+            if is_timestamp:
+                record[new_key] = normalize_timestamp(value)
+            elif value_type is str:
+                record[new_key] = value.strip()
+            elif value_type is dict or value_type is list:
+                # Nested values are rare; let normalize_record walk them
+                record[new_key] = normalize_record(
+                    {key: value}, timestamp_set, normalize_keys
+                )[new_key]
+            else:
+                record[new_key] = value
+        return record
+    
+    def transform(records: Iterable[dict]) -> TransformResult:
+        # dedupe key -> latest valid record (or all valid records if no dedupe)
+        latest: dict[tuple, dict] = {}
+        valid_records: list[dict] = []
+        invalid_records: list[dict] = []
+        null_key_count = 0
+        input_count = 0
+        
+        for i, raw in enumerate(records):
+            input_count += 1
+            if flatten:
+                raw = flatten_json(raw)
+            record = normalize(raw)
+            
+            if required_fields and not _has_required_fields(record, required_fields):
+                result = validate_required_fields(record, required_fields)
+                invalid_records.append({
+                    "_validation_errors": result.errors,
+                    "_record_index": i,
+                    "record": record,
+                })
+                continue
+            
+            if not dedupe_key_fields:
+                valid_records.append(record)
+                continue
+            
+            key = tuple(record.get(f) for f in dedupe_key_fields)
+            if None in key:
+                null_key_count += 1
+                continue
+            
+            current = latest.get(key)
+            if current is None or (dedupe_sort_field and (
+                (record.get(dedupe_sort_field) or "") > (current.get(dedupe_sort_field) or "")
+            )):
+                latest[key] = record
+        
+        if dedupe_key_fields:
+            valid_records = list(latest.values())
+        
+        if null_key_count:
+            logger.warning(
+                f"Skipped {null_key_count} records with null key fields",
+                extra={"key_fields": list(dedupe_key_fields), "null_key_count": null_key_count}
+            )
+        
+        logger.info(
+            "Transformation complete",
+            extra={
+                "input_count": input_count,
+                "valid_count": len(valid_records),
+                "invalid_count": len(invalid_records),
+            }
+        )
+        
+        return TransformResult(
+            valid_records=valid_records,
+            invalid_records=invalid_records,
+            input_count=input_count,
+        )
+    
+    return transform
+
+
+def transform_record_stream(
+    records: Iterable[dict],
+    required_fields: Optional[list[str]] = None,
+    timestamp_fields: Optional[list[str]] = None,
+    dedupe_key_fields: Optional[list[str]] = None,
+    dedupe_sort_field: Optional[str] = None,
+    flatten: bool = False,
+    normalize_keys: bool = True,
+) -> TransformResult:
+    """Single-pass transform over an iterable: normalize → validate → dedupe.
+    
+    Same steps as transform_records, applied one record at a time as the
+    iterable is consumed (e.g. straight from a paginating API client), so
+    neither the raw nor the normalized batch is ever held as a list. Only
+    the latest valid record per dedupe key and the invalid records are kept.
+    
+    Valid records come back in first-seen order of their dedupe key.
+    
+    Args:
+        records: Raw records (any iterable, consumed once)
+        required_fields: Fields required for validation
+        timestamp_fields: Fields to normalize as timestamps
+        dedupe_key_fields: Fields for deduplication key
+        dedupe_sort_field: Field deciding which duplicate is newest
+        flatten: Whether to flatten nested JSON
+        normalize_keys: Whether to convert keys to snake_case
+        
+    Returns:
+        TransformResult with valid records, invalid records (shaped as in
+        validate_records) and input count
+    """
+    transform = make_transformer(
+        required_fields=tuple(required_fields or ()),
+        timestamp_fields=tuple(timestamp_fields or ()),
+        dedupe_key_fields=tuple(dedupe_key_fields or ()),
+        dedupe_sort_field=dedupe_sort_field,
+        flatten=flatten,
+        normalize_keys=normalize_keys,
+    )
+    return transform(records)
+
+
+# Batches smaller than this are transformed serially: below it, process
+# start-up and pickling records to workers cost more than they save
+PARALLEL_MIN_RECORDS = 50_000
+PARALLEL_CHUNK_SIZE = 10_000
+
+
+def _transform_chunk(
+    chunk: list[dict],
+    offset: int,
+    required_fields: tuple[str, ...],
+    timestamp_fields: tuple[str, ...],
+    flatten: bool,
+    normalize_keys: bool,
+) -> TransformResult:
+    """Worker for transform_records_parallel: transform one chunk, no dedupe."""
+    result = make_transformer(
+        required_fields=required_fields,
+        timestamp_fields=timestamp_fields,
+        flatten=flatten,
+        normalize_keys=normalize_keys,
+    )(chunk)
+    # Report indices relative to the whole batch
+    for entry in result.invalid_records:
+        entry["_record_index"] += offset
+    return result
+
+
+def transform_records_parallel(
+    records: Sequence[dict],
+    required_fields: Optional[list[str]] = None,
+    timestamp_fields: Optional[list[str]] = None,
+    dedupe_key_fields: Optional[list[str]] = None,
+    dedupe_sort_field: Optional[str] = None,
+    flatten: bool = False,
+    normalize_keys: bool = True,
+    n_workers: Optional[int] = None,
+    chunksize: int = PARALLEL_CHUNK_SIZE,
+) -> tuple[list[dict], list[dict]]:
+    """transform_records across worker processes, for large CPU-bound batches.
+    
+    Chunks of records are flattened, normalized and validated in parallel
+    (sidestepping the GIL); the merged valid records are then deduped in
+    this process with one dedupe_records pass, which keeps the same record
+    per key as transform_records. Batches under PARALLEL_MIN_RECORDS, or
+    n_workers=1, run serially.
+    
+    Args:
+        records: Raw records to transform
+        required_fields: Fields required for validation
+        timestamp_fields: Fields to normalize as timestamps
+        dedupe_key_fields: Fields for deduplication key
+        dedupe_sort_field: Field to sort by for deduplication
+        flatten: Whether to flatten nested JSON
+        normalize_keys: Whether to convert keys to snake_case
+        n_workers: Worker processes (default: CPU count)
+        chunksize: Records sent to a worker at a time
+        
+    Returns:
+        Tuple of (valid_records, invalid_records)
+    """
+    if len(records) < PARALLEL_MIN_RECORDS or n_workers == 1:
+        return transform_records(
+            records,
+            required_fields=required_fields,
+            timestamp_fields=timestamp_fields,
+            dedupe_key_fields=dedupe_key_fields,
+            dedupe_sort_field=dedupe_sort_field,
+            flatten=flatten,
+            normalize_keys=normalize_keys,
+        )
+    
+    offsets = range(0, len(records), chunksize)
+    chunk_count = len(offsets)
+    valid_records: list[dict] = []
+    invalid_records: list[dict] = []
+    
+    with ProcessPoolExecutor(max_workers=n_workers) as executor:
+        # map() yields in input order, so first-seen key order is preserved
+        for result in executor.map(
+            _transform_chunk,
+            (records[offset:offset + chunksize] for offset in offsets),
+            offsets,
+            [tuple(required_fields or ())] * chunk_count,
+            [tuple(timestamp_fields or ())] * chunk_count,
+            [flatten] * chunk_count,
+            [normalize_keys] * chunk_count,
+        ):
+            valid_records.extend(result.valid_records)
+            invalid_records.extend(result.invalid_records)
     
-    # Step 4: Deduplicate
     if dedupe_key_fields:
         valid_records = dedupe_records(
-            valid_records,
-            key_fields=dedupe_key_fields,
-            sort_field=dedupe_sort_field,
-            keep="last",
+            valid_records, list(dedupe_key_fields), sort_field=dedupe_sort_field
         )
     
+    return valid_records, invalid_records
+
+
+def transform_table(
+    table,
+    required_fields: Optional[list[str]] = None,
+    timestamp_fields: Optional[list[str]] = None,
+    dedupe_key_fields: Optional[list[str]] = None,
+    dedupe_sort_field: Optional[str] = None,
+    normalize_keys: bool = True,
+):
+    """Columnar transform of a pyarrow Table: normalize → validate → dedupe.
+    
+    Vectorized counterpart of transform_records for large homogeneous
+    batches (e.g. from a client's fetch_arrow()); every step runs as an
+    Arrow compute kernel over whole columns. Requires pyarrow.
+    
+    Differences from the per-record pipeline:
+    - Only top-level columns are normalized; nested struct fields keep
+      their keys and string values as-is.
+    - Timestamps with a UTC offset are converted to UTC. A timestamp
+      column Arrow cannot cast falls back to normalize_timestamp per value.
+    - Invalid rows carry no _validation_errors/_record_index columns.
+    - Valid rows come back ordered by dedupe key rather than input order.
+    
+    Args:
+        table: pyarrow.Table of raw records
+        required_fields: Fields required for validation
+        timestamp_fields: Fields to normalize as timestamps
+        dedupe_key_fields: Fields for deduplication key
+        dedupe_sort_field: Field deciding which duplicate is newest
+        normalize_keys: Whether to convert column names to snake_case
+        
+    Returns:
+        Tuple of (valid_table, invalid_table)
+    """
+    try:
+        import pyarrow as pa
+        import pyarrow.compute as pc
+    except ImportError:
+        raise ImportError("pyarrow is required for vectorized transforms")
+    
+    required_fields = required_fields or []
+    timestamp_fields = timestamp_fields or []
+    input_count = table.num_rows
+    
+    if normalize_keys:
+        table = table.rename_columns([normalize_key(name) for name in table.column_names])
+    
+    # Step 1: Normalize string and timestamp columns
+    for i, name in enumerate(table.column_names):
+        column = table.column(i)
+        if name in timestamp_fields:
+            # Only string columns cast safely (Arrow reads epoch ints as µs)
+            parsed = None
+            if pa.types.is_string(column.type):
+                try:
+                    parsed = pc.cast(column, pa.timestamp("us", tz="UTC"))
+                except pa.ArrowInvalid:
+                    pass
+            if parsed is not None:
+                # %S renders fractional seconds at the column's unit
+                column = pc.strftime(parsed, format="%Y-%m-%dT%H:%M:%SZ")
+            else:
+                column = pa.array(
+                    [normalize_timestamp(v) for v in column.to_pylist()],
+                    type=pa.string(),
+                )
+        elif pa.types.is_string(column.type) or pa.types.is_large_string(column.type):
+            column = pc.utf8_trim_whitespace(column)
+        else:
+            continue
+        table = table.set_column(i, name, column)
+    
+    # Step 2: Validate required fields (present, non-null, non-blank).
+    # Typed explicitly: an empty list would otherwise infer the null type
+    mask = pa.array([True] * table.num_rows, type=pa.bool_())
+    for field_name in required_fields:
+        if field_name not in table.column_names:
+            mask = pa.array([False] * table.num_rows, type=pa.bool_())
+            break
+        column = table[field_name]
+        present = pc.is_valid(column)
+        if pa.types.is_string(column.type) or pa.types.is_large_string(column.type):
+            present = pc.and_(present, pc.fill_null(pc.not_equal(column, ""), False))
+        mask = pc.and_(mask, present)
+    
+    valid = table.filter(mask)
+    invalid = table.filter(pc.invert(mask))
+    
+    # Step 3: Deduplicate, keeping the newest row per key
+    if dedupe_key_fields and valid.num_rows:
+        for f in dedupe_key_fields:
+            valid = valid.filter(pc.is_valid(valid[f]))
+        
+        sort_keys = [(f, "ascending") for f in dedupe_key_fields]
+        if dedupe_sort_field and dedupe_sort_field in valid.column_names:
+            sort_keys.append((dedupe_sort_field, "descending"))
+        valid = valid.take(pc.sort_indices(valid, sort_keys=sort_keys))
+        
+        # After sorting, the first row of each key run is the newest
+        if valid.num_rows > 1:
+            first = pa.array([True] + [False] * (valid.num_rows - 1))
+            for f in dedupe_key_fields:
+                keys = valid[f].combine_chunks()
+                changed = pc.not_equal(keys.slice(1), keys.slice(0, len(keys) - 1))
+                first = pc.or_(first, pa.concat_arrays([pa.array([False]), changed]))
+            valid = valid.filter(first)
+    
     logger.info(
         f"Transformation complete",
         extra={
-            "input_count": len(records),
-            "valid_count": len(valid_records),
-            "invalid_count": len(invalid_records),
+            "input_count": input_count,
+            "valid_count": valid.num_rows,
+            "invalid_count": invalid.num_rows,
         }
     )
     
-    return valid_records, invalid_records
-
+    return valid, invalid
@@ -5,16 +5,35 @@ Includes:
 - Structured pipeline logging
 - File I/O helpers
 - S3 staging writer
+
+The S3 writer is imported on first attribute access, so importing this
+package does not pull in boto3.
 """
 
-from .logging_config import setup_logging, get_logger
+from .logging_config import setup_logging, get_logger, ContextAdapter
 from .file_io import write_jsonl, write_parquet, get_staging_path
-from .s3_writer import S3Writer, write_to_s3
 from .pipeline_logger import PipelineLogger, timed_operation
 
+_LAZY_IMPORTS = {
+    "S3Writer": ".s3_writer",
+    "write_to_s3": ".s3_writer",
+}
+
+
+def __getattr__(name: str):
+    """Import lazily exported names on first access (PEP 562)."""
+    if name in _LAZY_IMPORTS:
+        import importlib
+        
+        value = getattr(importlib.import_module(_LAZY_IMPORTS[name], __name__), name)
+        globals()[name] = value
+        return value
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
 __all__ = [
     "setup_logging",
     "get_logger",
+    "ContextAdapter",
     "write_jsonl",
     "write_parquet",
     "get_staging_path",
@@ -6,6 +6,17 @@ import sys
 from datetime import datetime, timezone
 from typing import Optional
 
+# orjson serializes log records several times faster than json; fall back
+# to the stdlib when it is not installed
+try:
+    import orjson
+    
+    def _dumps(data: dict) -> str:
+        return orjson.dumps(data, default=str, option=orjson.OPT_NON_STR_KEYS).decode()
+except ImportError:
+    def _dumps(data: dict) -> str:
+        return json.dumps(data, default=str)
+
 
 class JSONFormatter(logging.Formatter):
     """JSON log formatter for structured logging."""
@@ -42,7 +53,23 @@ class JSONFormatter(logging.Formatter):
         if record.exc_info:
             log_data["exception"] = self.formatException(record.exc_info)
         
-        return json.dumps(log_data)
+        return _dumps(log_data)
+
+
+class ContextAdapter(logging.LoggerAdapter):
+    """LoggerAdapter that merges bound context into each call's extra.
+    
+    Unlike the stdlib adapter (before 3.13), per-call extra fields are kept;
+    they win over the bound context on key clashes.
+    
+    Usage:
+        log = ContextAdapter(logger, {"source": "api_a", "batch_id": batch_id})
+        log.info("Fetched", extra={"row_count": 10})
+    """
+    
+    def process(self, msg, kwargs):
+        kwargs["extra"] = {**self.extra, **kwargs.get("extra", {})}
+        return msg, kwargs
 
 
 def setup_logging(
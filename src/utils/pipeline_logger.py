@@ -13,11 +13,22 @@ import json
 import logging
 import time
 from contextlib import contextmanager
-from dataclasses import asdict, dataclass, field
+from dataclasses import dataclass, field
 from datetime import datetime, timezone
 from functools import wraps
 from typing import Any, Callable, Optional
 
+# orjson serializes log contexts several times faster than json; fall back
+# to the stdlib when it is not installed
+try:
+    import orjson
+    
+    def _dumps(data: dict) -> str:
+        return orjson.dumps(data, default=str).decode()
+except ImportError:
+    def _dumps(data: dict) -> str:
+        return json.dumps(data, default=str)
+
 logger = logging.getLogger(__name__)
 
 
@@ -38,19 +49,29 @@ class PipelineLogContext:
     
     def to_dict(self) -> dict:
         """Convert to dictionary for logging."""
-        data = asdict(self)
+        # Shallow copy of the fields; asdict() would deep-copy `extra`
+        data = {k: v for k, v in self.__dict__.items() if v is not None}
         data["timestamp"] = datetime.now(timezone.utc).isoformat()
-        # Remove None values
-        return {k: v for k, v in data.items() if v is not None}
+        return data
     
     def to_json(self) -> str:
         """Convert to JSON string."""
-        return json.dumps(self.to_dict(), default=str)
+        return _dumps(self.to_dict())
 
 
 class PipelineLogger:
     """Structured logger for pipeline operations."""
     
+    __slots__ = (
+        "_base_ctx",
+        "_request_times",
+        "_retry_count",
+        "_start_time",
+        "batch_id",
+        "logger",
+        "source",
+    )
+    
     def __init__(self, source: str, batch_id: str):
         """Initialize pipeline logger.
         
@@ -61,31 +82,43 @@ class PipelineLogger:
         self.source = source
         self.batch_id = batch_id
         self.logger = logging.getLogger(f"pipeline.{source}")
+        # Fields shared by every log line from this logger
+        self._base_ctx = {"source": source, "batch_id": batch_id}
         self._start_time: Optional[float] = None
         self._request_times: list[float] = []
         self._retry_count: int = 0
     
     def _log(self, level: int, step: str, **kwargs) -> None:
         """Internal logging method with structured context."""
-        ctx = PipelineLogContext(
-            source=self.source,
-            batch_id=self.batch_id,
-            step=step,
-            retry_count=self._retry_count,
-            **kwargs
-        )
-        self.logger.log(level, ctx.to_json(), extra=ctx.to_dict())
+        # Building and serializing the context is the expensive part; skip
+        # it entirely when the level is filtered out
+        if not self.logger.isEnabledFor(level):
+            return
+        # Same fields as PipelineLogContext.to_dict(), built as a plain dict
+        # and serialized once
+        data = {
+            **self._base_ctx,
+            "step": step,
+            "row_count": 0,
+            "retry_count": self._retry_count,
+            "status": "started",
+            **kwargs,
+        }
+        data = {k: v for k, v in data.items() if v is not None}
+        data.setdefault("extra", {})
+        data["timestamp"] = datetime.now(timezone.utc).isoformat()
+        self.logger.log(level, _dumps(data), extra=data)
     
     def start(self, step: str) -> None:
         """Log step start."""
-        self._start_time = time.time()
+        self._start_time = time.perf_counter()
         self._log(logging.INFO, step, status="started")
     
     def success(self, step: str, **kwargs) -> None:
         """Log step success."""
         duration = None
-        if self._start_time:
-            duration = (time.time() - self._start_time) * 1000
+        if self._start_time is not None:
+            duration = (time.perf_counter() - self._start_time) * 1000
         self._log(
             logging.INFO,
             step,
@@ -97,8 +130,8 @@ class PipelineLogger:
     def error(self, step: str, error: Exception, **kwargs) -> None:
         """Log step error."""
         duration = None
-        if self._start_time:
-            duration = (time.time() - self._start_time) * 1000
+        if self._start_time is not None:
+            duration = (time.perf_counter() - self._start_time) * 1000
         self._log(
             logging.ERROR,
             step,
@@ -190,6 +223,15 @@ class PipelineLogger:
         }
 
 
+class _Timer:
+    """Timing result yielded by timed_operation."""
+    
+    __slots__ = ("duration_ms",)
+    
+    def __init__(self):
+        self.duration_ms = 0
+
+
 @contextmanager
 def timed_operation(name: str, logger: logging.Logger = None):
     """Context manager to time an operation.
@@ -206,21 +248,16 @@ def timed_operation(name: str, logger: logging.Logger = None):
     Yields:
         Timer object with duration_ms attribute
     """
-    class Timer:
-        def __init__(self):
-            self.start_time = time.time()
-            self.end_time = None
-            self.duration_ms = 0
-    
-    timer = Timer()
+    timer = _Timer()
+    # Monotonic, high-resolution clock: immune to wall-clock adjustments
+    start_ns = time.perf_counter_ns()
     
     try:
         yield timer
     finally:
-        timer.end_time = time.time()
-        timer.duration_ms = (timer.end_time - timer.start_time) * 1000
+        timer.duration_ms = (time.perf_counter_ns() - start_ns) / 1e6
         
-        if logger:
+        if logger and logger.isEnabledFor(logging.DEBUG):
             logger.debug(
                 f"Operation '{name}' completed",
                 extra={"operation": name, "duration_ms": timer.duration_ms}
@@ -1,25 +1,96 @@
-"""S3 writer for staging data files."""
+"""S3 writer for staging data files.
+
+boto3 is imported when the first S3 client is created rather than at module
+load, so importing this module (e.g. for FILE_FORMATS) stays cheap.
+"""
 
-import json
 import logging
 import os
+import secrets
 import tempfile
-import uuid
+import zlib
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timezone
+from functools import lru_cache
 from pathlib import Path
-from typing import Optional
+from typing import Iterable, Optional
 
-import boto3
-from botocore.exceptions import ClientError
+from src.utils.file_io import prefixed_line_encoder
 
 logger = logging.getLogger(__name__)
 
+# Large staging files go up as concurrent multipart parts
+MULTIPART_CHUNK_BYTES = 8 * 1024 * 1024
+MULTIPART_CONCURRENCY = 16
+
+# Parts a streaming JSONL upload keeps buffered and in flight at once
+# (bounds its memory at this many MULTIPART_CHUNK_BYTES buffers)
+STREAM_PARTS_IN_FLIGHT = 4
+
+# Batches S3Writer.write_many stages at once
+WRITE_MANY_CONCURRENCY = 4
+
+# Connection pool for the S3 client: enough for concurrent sources each
+# running MULTIPART_CONCURRENCY part uploads, kept alive between uploads
+# (botocore Config kwargs)
+S3_CLIENT_CONFIG = {
+    "max_pool_connections": 50,
+    "retries": {"max_attempts": 5, "mode": "adaptive"},
+    "tcp_keepalive": True,
+}
+
+# Staging file formats: format -> (file extension, content type)
+FILE_FORMATS = {
+    "jsonl": ("jsonl", "application/jsonl"),
+    "jsonl.gz": ("jsonl.gz", "application/gzip"),
+    "parquet": ("parquet", "application/vnd.apache.parquet"),
+}
+
+# gzip level for jsonl.gz: most of level 9's ratio at a fraction of the CPU
+GZIP_COMPRESSLEVEL = 6
+
+# Records converted to Arrow per batch, and rows per Parquet row group
+PARQUET_ROW_GROUP_SIZE = 128_000
+
+# zstd level and data page size for staged Parquet files
+PARQUET_ZSTD_LEVEL = 3
+PARQUET_DATA_PAGE_BYTES = 1 << 20
+
+
+@lru_cache(maxsize=8)
+def _get_s3_client(
+    aws_access_key_id: Optional[str],
+    aws_secret_access_key: Optional[str],
+    region_name: str,
+):
+    """Return a shared S3 client for a set of credentials and region.
+    
+    Creating a client re-parses the botocore service model and starts with
+    a cold connection pool, so writers with the same settings share one
+    (boto3 clients are thread-safe).
+    """
+    import boto3
+    from botocore.config import Config
+    
+    return boto3.session.Session().client(
+        "s3",
+        aws_access_key_id=aws_access_key_id,
+        aws_secret_access_key=aws_secret_access_key,
+        region_name=region_name,
+        config=Config(**S3_CLIENT_CONFIG),
+    )
+
 
 class S3Writer:
-    """Write JSONL files to S3 staging bucket.
+    """Write JSONL (or Parquet) files to S3 staging bucket.
     
     Follows staging path convention:
     source=<source>/dt=YYYY-MM-DD/hour=HH/batch_id=<id>/part-0001.jsonl
+    
+    Parquet output is opt-in: the Snowpipes load with the JSON file format
+    (ff_jsonl), so they need a Parquet file format before switching.
+    Gzipped JSONL (jsonl.gz) needs no pipe change; ff_jsonl detects the
+    compression from the .gz extension.
     """
     
     def __init__(
@@ -28,6 +99,7 @@ class S3Writer:
         aws_access_key_id: Optional[str] = None,
         aws_secret_access_key: Optional[str] = None,
         region_name: Optional[str] = None,
+        file_format: str = "jsonl",
     ):
         """Initialize S3 writer.
         
@@ -36,16 +108,33 @@ class S3Writer:
             aws_access_key_id: AWS access key (or from env)
             aws_secret_access_key: AWS secret key (or from env)
             region_name: AWS region (or from env: AWS_REGION)
+            file_format: Staging file format, "jsonl", "jsonl.gz" or
+                "parquet" (parquet requires pyarrow)
         """
         self.bucket = bucket or os.getenv("S3_BUCKET")
         if not self.bucket:
             raise ValueError("S3_BUCKET is required")
         
-        self.s3_client = boto3.client(
-            "s3",
-            aws_access_key_id=aws_access_key_id or os.getenv("AWS_ACCESS_KEY_ID"),
-            aws_secret_access_key=aws_secret_access_key or os.getenv("AWS_SECRET_ACCESS_KEY"),
-            region_name=region_name or os.getenv("AWS_REGION", "us-east-1"),
+        if file_format not in FILE_FORMATS:
+            raise ValueError(
+                f"Unsupported file_format {file_format!r}; expected one of {list(FILE_FORMATS)}"
+            )
+        self.file_format = file_format
+        
+        from boto3.s3.transfer import TransferConfig
+        
+        self.s3_client = _get_s3_client(
+            aws_access_key_id or os.getenv("AWS_ACCESS_KEY_ID"),
+            aws_secret_access_key or os.getenv("AWS_SECRET_ACCESS_KEY"),
+            region_name or os.getenv("AWS_REGION", "us-east-1"),
+        )
+        
+        # Built once and reused for every upload from this writer
+        self._transfer_config = TransferConfig(
+            multipart_threshold=MULTIPART_CHUNK_BYTES,
+            multipart_chunksize=MULTIPART_CHUNK_BYTES,
+            max_concurrency=MULTIPART_CONCURRENCY,
+            use_threads=True,
         )
     
     def _build_staging_path(
@@ -56,7 +145,7 @@ class S3Writer:
     ) -> str:
         """Build staging path following convention.
         
-        Pattern: source=<source>/dt=YYYY-MM-DD/hour=HH/batch_id=<id>/part-0001.jsonl
+        Pattern: source=<source>/dt=YYYY-MM-DD/hour=HH/batch_id=<id>/part-0001.<ext>
         
         Args:
             source: Data source name (e.g., 'api_a', 'api_b')
@@ -69,44 +158,196 @@ class S3Writer:
         if dt is None:
             dt = datetime.now(timezone.utc)
         
-        date_str = dt.strftime("%Y-%m-%d")
+        date_str = f"{dt.year:04d}-{dt.month:02d}-{dt.day:02d}"
         hour_str = f"{dt.hour:02d}"
         
-        path = f"source={source}/dt={date_str}/hour={hour_str}/batch_id={batch_id}/part-0001.jsonl"
+        extension = FILE_FORMATS[self.file_format][0]
+        path = f"source={source}/dt={date_str}/hour={hour_str}/batch_id={batch_id}/part-0001.{extension}"
         return path
     
-    def _write_jsonl_local(
+    def _stream_jsonl_to_s3(
+        self,
+        records: Iterable[dict],
+        s3_key: str,
+        batch_id: str,
+        source: str,
+        extracted_at: str,
+    ) -> tuple[int, int]:
+        """Encode records as JSONL (gzipped for jsonl.gz) straight into S3.
+        
+        Lines are encoded into an in-memory buffer that is sent as a
+        multipart part every MULTIPART_CHUNK_BYTES, so there is no local
+        file and encoding overlaps with uploading (up to
+        STREAM_PARTS_IN_FLIGHT parts at once). Batches smaller than one
+        part go up with a single put_object. A failed multipart upload is
+        aborted so no orphaned parts are left behind.
+        
+        Args:
+            records: Records to write (any iterable)
+            s3_key: S3 object key
+            batch_id: Batch identifier for metadata
+            source: Source identifier for metadata
+            extracted_at: Extraction timestamp stamped on every record
+            
+        Returns:
+            Tuple of (records written, bytes uploaded); nothing is uploaded
+            when there are no records
+        """
+        content_type = FILE_FORMATS[self.file_format][1]
+        # wbits=31 writes a gzip header/trailer, same as gzip.open()
+        compressor = (
+            zlib.compressobj(GZIP_COMPRESSLEVEL, zlib.DEFLATED, 31)
+            if self.file_format == "jsonl.gz" else None
+        )
+        
+        # Pipeline metadata added to each record, encoded once
+        encode = prefixed_line_encoder({
+            "_batch_id": batch_id,
+            "_source": source,
+            "_extracted_at": extracted_at,
+        })
+        
+        record_count = 0
+        uploaded_bytes = 0
+        buf = bytearray()
+        upload_id = None
+        parts: list = []
+        
+        def send_part(executor: ThreadPoolExecutor, body: bytes) -> None:
+            nonlocal upload_id
+            if upload_id is None:
+                upload_id = self.s3_client.create_multipart_upload(
+                    Bucket=self.bucket, Key=s3_key, ContentType=content_type,
+                )["UploadId"]
+            # Bound buffered parts: wait for the oldest before queueing more
+            if len(parts) >= STREAM_PARTS_IN_FLIGHT:
+                parts[-STREAM_PARTS_IN_FLIGHT][1].result()
+            part_number = len(parts) + 1
+            parts.append((part_number, executor.submit(
+                self.s3_client.upload_part,
+                Bucket=self.bucket,
+                Key=s3_key,
+                UploadId=upload_id,
+                PartNumber=part_number,
+                Body=body,
+            )))
+        
+        try:
+            with ThreadPoolExecutor(max_workers=STREAM_PARTS_IN_FLIGHT) as executor:
+                for record in records:
+                    record_count += 1
+                    line = encode(record)
+                    buf += compressor.compress(line) if compressor else line
+                    
+                    if len(buf) >= MULTIPART_CHUNK_BYTES:
+                        uploaded_bytes += len(buf)
+                        send_part(executor, bytes(buf))
+                        buf.clear()
+                
+                if not record_count:
+                    return 0, 0
+                
+                if compressor:
+                    buf += compressor.flush()
+                
+                if upload_id is None:
+                    # Whole batch fits in one part: a plain PUT is cheaper
+                    self.s3_client.put_object(
+                        Bucket=self.bucket,
+                        Key=s3_key,
+                        Body=bytes(buf),
+                        ContentType=content_type,
+                    )
+                    return record_count, len(buf)
+                
+                if buf:
+                    # The last part may be smaller than the 5 MiB minimum
+                    uploaded_bytes += len(buf)
+                    send_part(executor, bytes(buf))
+                
+                completed = [
+                    {"PartNumber": number, "ETag": future.result()["ETag"]}
+                    for number, future in parts
+                ]
+            
+            self.s3_client.complete_multipart_upload(
+                Bucket=self.bucket,
+                Key=s3_key,
+                UploadId=upload_id,
+                MultipartUpload={"Parts": completed},
+            )
+            return record_count, uploaded_bytes
+            
+        except Exception as e:
+            if upload_id is not None:
+                logger.error(f"Aborting multipart upload to s3://{self.bucket}/{s3_key}: {e}")
+                self.s3_client.abort_multipart_upload(
+                    Bucket=self.bucket, Key=s3_key, UploadId=upload_id,
+                )
+            raise
+    
+    def _write_parquet_local(
         self,
-        records: list[dict],
+        records: Iterable[dict],
         file_path: Path,
         batch_id: str,
         source: str,
-    ) -> int:
-        """Write records to local JSONL file.
+        extracted_at: str,
+    ) -> tuple[int, int]:
+        """Write records to a local zstd-compressed Parquet file.
+        
+        Records are converted to Arrow PARQUET_ROW_GROUP_SIZE at a time, so
+        only one batch is ever held as Python dicts. Batch schemas are
+        unified (e.g. int -> double, missing columns -> null) before writing.
         
         Args:
-            records: List of records to write
+            records: Records to write (any iterable)
             file_path: Local file path
             batch_id: Batch identifier for metadata
             source: Source identifier for metadata
+            extracted_at: Extraction timestamp stamped on every record
             
         Returns:
-            Number of bytes written
+            Tuple of (records written, bytes written)
         """
-        extracted_at = datetime.now(timezone.utc).isoformat()
+        try:
+            import pyarrow as pa
+            import pyarrow.parquet as pq
+        except ImportError:
+            raise ImportError("pyarrow is required for Parquet support")
+        
+        tables = []
+        batch = []
+        
+        for record in records:
+            batch.append({
+                "_batch_id": batch_id,
+                "_source": source,
+                "_extracted_at": extracted_at,
+                **record,
+            })
+            if len(batch) >= PARQUET_ROW_GROUP_SIZE:
+                tables.append(pa.Table.from_pylist(batch))
+                batch = []
+        if batch:
+            tables.append(pa.Table.from_pylist(batch))
+        
+        if not tables:
+            return 0, 0
         
-        with open(file_path, "w", encoding="utf-8") as f:
-            for record in records:
-                # Add pipeline metadata
-                enriched = {
-                    "_batch_id": batch_id,
-                    "_source": source,
-                    "_extracted_at": extracted_at,
-                    **record,
-                }
-                f.write(json.dumps(enriched, default=str) + "\n")
-        
-        return file_path.stat().st_size
+        table = pa.concat_tables(tables, promote_options="permissive")
+        # Write through an Arrow file sink, whose position is the file size
+        with pa.OSFile(str(file_path), "wb") as sink:
+            pq.write_table(
+                table,
+                sink,
+                compression="zstd",
+                compression_level=PARQUET_ZSTD_LEVEL,
+                row_group_size=PARQUET_ROW_GROUP_SIZE,
+                data_page_size=PARQUET_DATA_PAGE_BYTES,
+            )
+            file_size = sink.tell()
+        return table.num_rows, file_size
     
     def _upload_to_s3(
         self,
@@ -115,6 +356,9 @@ class S3Writer:
     ) -> str:
         """Upload local file to S3.
         
+        Files above MULTIPART_CHUNK_BYTES are uploaded as multipart parts,
+        MULTIPART_CONCURRENCY at a time.
+        
         Args:
             local_path: Path to local file
             s3_key: S3 object key
@@ -122,12 +366,15 @@ class S3Writer:
         Returns:
             S3 URI of uploaded file
         """
+        from botocore.exceptions import ClientError
+        
         try:
             self.s3_client.upload_file(
                 str(local_path),
                 self.bucket,
                 s3_key,
-                ExtraArgs={"ContentType": "application/jsonl"},
+                ExtraArgs={"ContentType": FILE_FORMATS[self.file_format][1]},
+                Config=self._transfer_config,
             )
             
             s3_uri = f"s3://{self.bucket}/{s3_key}"
@@ -140,15 +387,19 @@ class S3Writer:
     
     def write(
         self,
-        records: list[dict],
+        records: Iterable[dict],
         source: str,
         batch_id: Optional[str] = None,
         dt: Optional[datetime] = None,
     ) -> dict:
-        """Write records to S3 as JSONL.
+        """Write records to S3 as JSONL (or Parquet, per file_format).
+        
+        JSONL is encoded and uploaded in multipart chunks as records are
+        consumed, so passing a generator keeps memory flat regardless of
+        batch size; Parquet is built in a local temp file and then uploaded.
         
         Args:
-            records: List of records to write
+            records: Records to write (a list or any iterable)
             source: Data source name (e.g., 'api_a', 'api_b')
             batch_id: Optional batch ID (auto-generated if not provided)
             dt: Optional datetime for path partitioning
@@ -166,41 +417,42 @@ class S3Writer:
                 "extracted_at": "2025-01-15T10:00:00Z"
             }
         """
-        if not records:
-            logger.warning(f"No records to write for source={source}")
-            return {
-                "s3_uri": None,
-                "record_count": 0,
-                "source": source,
-                "batch_id": batch_id,
-            }
-        
         # Generate batch ID if not provided
         if batch_id is None:
-            batch_id = uuid.uuid4().hex[:12]
+            batch_id = secrets.token_hex(6)
         
         # Build S3 key
         s3_key = self._build_staging_path(source, batch_id, dt)
         
-        # Write to temp file then upload
-        with tempfile.TemporaryDirectory() as tmpdir:
-            local_path = Path(tmpdir) / "data.jsonl"
-            
-            # Write JSONL locally
-            file_size = self._write_jsonl_local(records, local_path, batch_id, source)
-            
-            logger.info(
-                f"Wrote {len(records)} records ({file_size} bytes) to local file",
-                extra={
-                    "source": source,
-                    "batch_id": batch_id,
-                    "record_count": len(records),
-                    "file_size_bytes": file_size,
-                }
+        # One timestamp for the rows and the returned metadata
+        extracted_at = datetime.now(timezone.utc).isoformat()
+        
+        if self.file_format == "parquet":
+            # Parquet needs the whole table before it can be written, so it
+            # goes through a local temp file
+            with tempfile.TemporaryDirectory() as tmpdir:
+                local_path = Path(tmpdir) / f"data.{FILE_FORMATS[self.file_format][0]}"
+                record_count, file_size = self._write_parquet_local(
+                    records, local_path, batch_id, source, extracted_at
+                )
+                if record_count:
+                    s3_uri = self._upload_to_s3(local_path, s3_key)
+        else:
+            record_count, file_size = self._stream_jsonl_to_s3(
+                records, s3_key, batch_id, source, extracted_at
             )
-            
-            # Upload to S3
-            s3_uri = self._upload_to_s3(local_path, s3_key)
+            s3_uri = f"s3://{self.bucket}/{s3_key}"
+            if record_count:
+                logger.info(f"Uploaded to {s3_uri}")
+        
+        if not record_count:
+            logger.warning(f"No records to write for source={source}")
+            return {
+                "s3_uri": None,
+                "record_count": 0,
+                "source": source,
+                "batch_id": batch_id,
+            }
         
         metadata = {
             "s3_uri": s3_uri,
@@ -208,21 +460,54 @@ class S3Writer:
             "bucket": self.bucket,
             "batch_id": batch_id,
             "source": source,
-            "record_count": len(records),
+            "record_count": record_count,
             "file_size_bytes": file_size,
-            "extracted_at": datetime.now(timezone.utc).isoformat(),
+            "extracted_at": extracted_at,
         }
         
         logger.info(
-            f"Successfully staged {len(records)} records to S3",
+            f"Successfully staged {record_count} records to S3",
             extra=metadata
         )
         
         return metadata
+    
+    def write_many(
+        self,
+        batches: Iterable[tuple[Iterable[dict], str]],
+        batch_id: Optional[str] = None,
+        dt: Optional[datetime] = None,
+    ) -> list[dict]:
+        """Write several (records, source) batches to S3 concurrently.
+        
+        Each batch is written with write() on its own thread, up to
+        WRITE_MANY_CONCURRENCY at a time; uploads are I/O-bound and the
+        shared client is thread-safe, so batches overlap on the network.
+        
+        Args:
+            batches: (records, source) pairs
+            batch_id: Optional batch ID shared by all batches (each write
+                generates its own if not provided)
+            dt: Optional datetime for path partitioning
+            
+        Returns:
+            Metadata dicts from write(), in the order of batches
+        """
+        batches = list(batches)
+        if not batches:
+            return []
+        
+        workers = min(len(batches), WRITE_MANY_CONCURRENCY)
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            futures = [
+                executor.submit(self.write, records, source, batch_id, dt)
+                for records, source in batches
+            ]
+            return [future.result() for future in futures]
 
 
 def write_to_s3(
-    records: list[dict],
+    records: Iterable[dict],
     source: str,
     batch_id: Optional[str] = None,
 ) -> dict:
@@ -231,7 +516,7 @@ def write_to_s3(
     Uses environment variables for configuration.
     
     Args:
-        records: List of records to write
+        records: Records to write (a list or any iterable)
         source: Data source name
         batch_id: Optional batch identifier
         
@@ -1,6 +1,6 @@
 """S3 staging path utilities following project conventions."""
 
-import uuid
+import secrets
 from datetime import datetime, timezone
 from typing import Optional
 
@@ -33,9 +33,9 @@ def get_staging_path(
     if hour is None:
         hour = dt.hour
     if batch_id is None:
-        batch_id = uuid.uuid4().hex[:12]
+        batch_id = secrets.token_hex(6)
     
-    date_str = dt.strftime("%Y-%m-%d")
+    date_str = f"{dt.year:04d}-{dt.month:02d}-{dt.day:02d}"
     hour_str = f"{hour:02d}"
     
     return f"source={source}/dt={date_str}/hour={hour_str}/batch_id={batch_id}/"
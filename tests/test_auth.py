@@ -0,0 +1,200 @@
+"""Tests for authentication modules."""
+
+import pytest
+from src.auth import oauth2
+from src.auth.api_key import APIKeyAuth, APIKeyLocation
+from src.auth.oauth2 import OAuth2Client
+
+
+@pytest.fixture(autouse=True)
+def clear_token_cache():
+    """Isolate tests from the process-wide token cache."""
+    oauth2._TOKEN_CACHE.clear()
+    yield
+    oauth2._TOKEN_CACHE.clear()
+
+
+@pytest.fixture
+def token_endpoint(monkeypatch):
+    """Fake token endpoint that counts grant requests."""
+    calls = []
+    
+    class FakeResponse:
+        def raise_for_status(self):
+            pass
+        
+        def json(self):
+            return {"access_token": f"token-{len(calls)}", "expires_in": 3600}
+    
+    def post(url, data=None, headers=None, timeout=None):
+        calls.append(data)
+        return FakeResponse()
+    
+    monkeypatch.setattr(oauth2.requests, "post", post)
+    return calls
+
+
+def make_client(client_secret="secret"):
+    """Build an OAuth2 client with fixed test settings."""
+    return OAuth2Client(
+        client_id="client",
+        client_secret=client_secret,
+        token_url="https://auth.example.com/token",
+    )
+
+
+class TestOAuth2TokenCache:
+    """Tests for the shared OAuth2 token cache."""
+    
+    def test_token_shared_across_instances(self, token_endpoint):
+        """Test a second client reuses the first client's token."""
+        first = make_client().get_access_token()
+        second = make_client().get_access_token()
+        
+        assert first == second == "token-1"
+        assert len(token_endpoint) == 1
+    
+    def test_different_credentials_not_shared(self, token_endpoint):
+        """Test clients with different secrets get separate tokens."""
+        make_client("secret-a").get_access_token()
+        make_client("secret-b").get_access_token()
+        
+        assert len(token_endpoint) == 2
+    
+    def test_invalidate_forces_new_token(self, token_endpoint):
+        """Test invalidate() makes the next call request a new token."""
+        client = make_client()
+        client.get_access_token()
+        client.invalidate()
+        
+        assert client.get_access_token() == "token-2"
+        assert make_client().get_access_token() == "token-2"
+    
+    def test_auth_header_built_once_per_token(self, token_endpoint):
+        """Test repeated calls return the same prebuilt header."""
+        client = make_client()
+        
+        assert client.get_auth_header() == {"Authorization": "Bearer token-1"}
+        assert client.get_auth_header() is client.get_auth_header()
+        client.close()
+    
+    def test_cache_key_does_not_contain_secret(self):
+        """Test secrets are hashed out of the cache key."""
+        assert "secret" not in make_client()._cache_key
+
+
+class TestOAuth2BackgroundRefresh:
+    """Tests for the background token refresh."""
+    
+    def test_refresh_scheduled_before_expiry(self, token_endpoint):
+        """Test a timer is started for expires_in minus the buffers."""
+        client = make_client()
+        client.get_access_token()
+        
+        timer = client._refresh_timer
+        assert timer is not None and timer.daemon
+        assert timer.interval == 3600 - client.token_expiry_buffer - client.REFRESH_LEAD_SECONDS
+        client.close()
+        assert client._refresh_timer is None
+    
+    def test_background_refresh_replaces_token(self, token_endpoint):
+        """Test the timer callback fetches a new token for all instances."""
+        client = make_client()
+        client.get_access_token()
+        client._background_refresh()
+        
+        assert client.get_access_token() == "token-2"
+        assert make_client().get_access_token() == "token-2"
+        client.close()
+    
+    def test_idle_client_stops_refreshing(self, token_endpoint):
+        """Test a token nobody used since the last refresh is not refreshed again."""
+        client = make_client()
+        client.get_access_token()
+        client._background_refresh()
+        client._background_refresh()
+        
+        assert len(token_endpoint) == 2
+        assert client._refresh_timer is None
+        assert client.get_access_token() == "token-2"
+        client.close()
+    
+    def test_close_stops_background_refresh(self, token_endpoint):
+        """Test close() cancels the timer and keeps later refreshes from re-arming it."""
+        client = make_client()
+        client.get_access_token()
+        client.close()
+        client._background_refresh()
+        
+        assert client._refresh_timer is None
+        assert len(token_endpoint) == 1
+
+
+class TestOAuth2DiskCache:
+    """Tests for the on-disk token cache."""
+    
+    def test_token_reused_from_disk_after_memory_loss(
+        self, token_endpoint, tmp_path, monkeypatch
+    ):
+        """Test a fresh process (empty memory cache) reads the token from disk."""
+        monkeypatch.setenv(oauth2.TOKEN_CACHE_DIR_ENV, str(tmp_path))
+        first = make_client()
+        first.get_access_token()
+        first.close()
+        oauth2._TOKEN_CACHE.clear()
+        
+        second = make_client()
+        
+        assert second.get_access_token() == "token-1"
+        assert len(token_endpoint) == 1
+        second.close()
+    
+    def test_disk_file_has_no_secrets(self, token_endpoint, tmp_path, monkeypatch):
+        """Test the token file omits the refresh token and is owner-only."""
+        monkeypatch.setenv(oauth2.TOKEN_CACHE_DIR_ENV, str(tmp_path))
+        client = make_client()
+        client.get_access_token()
+        
+        path = tmp_path / f"{client._cache_key}.json"
+        assert "refresh_token" not in path.read_text()
+        assert "secret" not in path.read_text()
+        assert path.stat().st_mode & 0o077 == 0
+        
+        client.invalidate()
+        assert not path.exists()
+    
+    def test_disk_cache_disabled_by_default(self, token_endpoint, tmp_path, monkeypatch):
+        """Test nothing is written without OAUTH_TOKEN_CACHE_DIR."""
+        monkeypatch.delenv(oauth2.TOKEN_CACHE_DIR_ENV, raising=False)
+        
+        assert oauth2._disk_token_path("key") is None
+
+
+class TestAPIKeyAuth:
+    """Tests for API key authentication."""
+    
+    def test_header_location(self):
+        """Test header placement returns the key only in headers."""
+        auth = APIKeyAuth("k", key_name="X-API-Key", location=APIKeyLocation.HEADER)
+        
+        assert auth.get_auth_header() == {"X-API-Key": "k"}
+        assert auth.get_auth_params() == {}
+    
+    def test_query_location(self):
+        """Test query placement returns the key only in params."""
+        auth = APIKeyAuth("k", key_name="api_key", location=APIKeyLocation.QUERY)
+        
+        assert auth.get_auth_header() == {}
+        assert auth.get_auth_params() == {"api_key": "k"}
+    
+    def test_apply_auth_does_not_mutate_inputs(self):
+        """Test apply_auth returns new dicts and leaves callers' dicts alone."""
+        auth = APIKeyAuth("k")
+        headers = {"Accept": "application/json"}
+        
+        new_headers, new_params = auth.apply_auth(headers, None)
+        
+        assert new_headers == {"Accept": "application/json", "X-API-Key": "k"}
+        assert new_params == {}
+        assert headers == {"Accept": "application/json"}
+        assert auth.get_auth_header() == {"X-API-Key": "k"}
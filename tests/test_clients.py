@@ -0,0 +1,407 @@
+"""Tests for API clients."""
+
+import json
+import socket
+import time
+
+import pytest
+import requests
+from src.clients import ApiAClient, ApiBClient, base
+from src.clients.base import RECENT_DURATIONS_SIZE, RequestMetrics
+
+
+@pytest.fixture(autouse=True)
+def clear_rate_windows():
+    """Isolate tests from the process-wide rate limit buckets."""
+    base._RATE_BUCKETS.clear()
+    yield
+    base._RATE_BUCKETS.clear()
+
+
+@pytest.fixture
+def api_a_client():
+    """API A client with fake OAuth2 settings (no token is requested)."""
+    return ApiAClient(
+        base_url="https://api-a.example.com",
+        client_id="client",
+        client_secret="secret",
+        token_url="https://auth.example.com/token",
+    )
+
+
+@pytest.fixture
+def api_b_client():
+    """API B client with a fake base URL and key."""
+    return ApiBClient(base_url="https://api-b.example.com", api_key="test-key", page_size=2)
+
+
+def fake_pages(records, page_size):
+    """Build a fake `get` that serves offset-paginated pages."""
+    calls = []
+    
+    def get(endpoint, params=None, headers=None):
+        calls.append(params)
+        offset = params["offset"]
+        return {
+            "items": records[offset:offset + page_size],
+            "total": len(records),
+            "offset": offset,
+            "limit": page_size,
+        }
+    
+    return get, calls
+
+
+def make_response(body, link=None):
+    """Build a requests.Response with a JSON body and optional Link header."""
+    response = requests.Response()
+    response.status_code = 200
+    response._content = json.dumps(body).encode()
+    if link:
+        response.headers["Link"] = link
+    return response
+
+
+class TestApiAPagination:
+    """Tests for API A cursor pagination."""
+    
+    def test_paginate_follows_cursors(self, api_a_client, monkeypatch):
+        """Test prefetched pages are yielded in cursor order."""
+        pages = {
+            None: {"data": [{"id": "1"}, {"id": "2"}], "meta": {"next_cursor": "c2"}},
+            "c2": {"data": [{"id": "3"}], "meta": {"next_cursor": "c3"}},
+            "c3": {"data": [{"id": "4"}], "meta": {}},
+        }
+        calls = []
+        
+        def get_with_next_link(endpoint, params=None, headers=None):
+            calls.append(params)
+            return pages[params.get("cursor")], None
+        
+        monkeypatch.setattr(api_a_client, "get_with_next_link", get_with_next_link)
+        
+        result = list(api_a_client.paginate("events", {"updated_since": "2024-01-01"}))
+        
+        assert [r["id"] for r in result] == ["1", "2", "3", "4"]
+        assert [c.get("cursor") for c in calls] == [None, "c2", "c3"]
+        assert all(c["updated_since"] == "2024-01-01" for c in calls)
+    
+    def test_paginate_stops_on_empty_page(self, api_a_client, monkeypatch):
+        """Test an empty data array ends pagination."""
+        monkeypatch.setattr(
+            api_a_client, "get_with_next_link",
+            lambda endpoint, params=None, headers=None: (
+                {"data": [], "meta": {"next_cursor": "x"}}, None
+            ),
+        )
+        
+        assert list(api_a_client.paginate("events")) == []
+    
+    def test_paginate_prefers_link_header(self, api_a_client, monkeypatch):
+        """Test a rel="next" Link header is followed instead of meta.next_cursor."""
+        next_url = "https://api-a.example.com/events?page_token=p2"
+        responses = {
+            "events": make_response(
+                {"data": [{"id": "1"}], "meta": {"next_cursor": "ignored"}},
+                link=f'<{next_url}>; rel="next"',
+            ),
+            next_url: make_response({"data": [{"id": "2"}], "meta": {}}),
+        }
+        requested = []
+        
+        def make_request(method, endpoint, params=None, json_data=None, headers=None):
+            requested.append(endpoint)
+            return responses[endpoint]
+        
+        monkeypatch.setattr(api_a_client, "_make_request", make_request)
+        
+        result = list(api_a_client.paginate("events"))
+        
+        assert [r["id"] for r in result] == ["1", "2"]
+        assert requested == ["events", next_url]
+
+
+class TestApiBPagination:
+    """Tests for API B offset pagination."""
+    
+    def test_paginate_returns_all_records_in_order(self, api_b_client, monkeypatch):
+        """Test concurrent page fetches yield records in offset order."""
+        records = [{"id": str(i)} for i in range(7)]
+        get, calls = fake_pages(records, page_size=2)
+        monkeypatch.setattr(api_b_client, "get", get)
+        
+        result = list(api_b_client.paginate("data"))
+        
+        assert result == records
+        assert sorted(c["offset"] for c in calls) == [0, 2, 4, 6]
+    
+    def test_paginate_pages_yields_whole_pages(self, api_b_client, monkeypatch):
+        """Test pages are yielded as lists and fetch() flattens them."""
+        records = [{"id": str(i)} for i in range(5)]
+        get, _ = fake_pages(records, page_size=2)
+        monkeypatch.setattr(api_b_client, "get", get)
+        
+        pages = list(api_b_client.paginate_pages("data"))
+        
+        assert [len(p) for p in pages] == [2, 2, 1]
+        assert api_b_client.fetch() == records
+    
+    def test_fetch_arrow_unifies_page_schemas(self, api_b_client, monkeypatch):
+        """Test pages with differing types/columns combine into one table."""
+        records = [
+            {"id": "1", "amount": 10},
+            {"id": "2", "amount": 20},
+            {"id": "3", "amount": 1.5, "notes": "x"},
+        ]
+        get, _ = fake_pages(records, page_size=2)
+        monkeypatch.setattr(api_b_client, "get", get)
+        
+        table = api_b_client.fetch_arrow()
+        
+        assert table.num_rows == 3
+        assert table.column("amount").to_pylist() == [10.0, 20.0, 1.5]
+        assert table.column("notes").to_pylist() == [None, None, "x"]
+    
+    def test_iter_many_stops_pending_requests_on_close(self, api_b_client, monkeypatch):
+        """Test closing iter_many() early skips requests not yet started."""
+        records = [{"id": str(i)} for i in range(10)]
+        get, calls = fake_pages(records, page_size=2)
+        
+        def slow_after_first(endpoint, params=None, headers=None):
+            if calls:
+                time.sleep(0.05)
+            return get(endpoint, params=params, headers=headers)
+        
+        monkeypatch.setattr(api_b_client, "get", slow_after_first)
+        api_b_client.max_concurrency = 1
+        
+        responses = api_b_client.iter_many(
+            "data", [{"offset": offset} for offset in range(0, 10, 2)]
+        )
+        first = next(responses)
+        responses.close()
+        
+        assert first["items"] == records[:2]
+        assert len(calls) <= 2
+    
+    def test_paginate_empty_first_page(self, api_b_client, monkeypatch):
+        """Test an empty first page stops after one request."""
+        get, calls = fake_pages([], page_size=2)
+        monkeypatch.setattr(api_b_client, "get", get)
+        
+        assert list(api_b_client.paginate("data")) == []
+        assert len(calls) == 1
+    
+    def test_paginate_passes_params_to_every_page(self, api_b_client, monkeypatch):
+        """Test caller params are sent with each page request."""
+        records = [{"id": str(i)} for i in range(4)]
+        get, calls = fake_pages(records, page_size=2)
+        monkeypatch.setattr(api_b_client, "get", get)
+        
+        list(api_b_client.paginate("data", {"modified_after": "2024-01-01"}))
+        
+        assert all(c["modified_after"] == "2024-01-01" for c in calls)
+
+
+class TestRateLimit:
+    """Tests for the token-bucket rate limiter."""
+    
+    def test_burst_up_to_limit_without_waiting(self, monkeypatch):
+        """Test a full bucket serves rate_limit_requests immediately."""
+        sleeps = []
+        monkeypatch.setattr("src.clients.base.time.sleep", sleeps.append)
+        monkeypatch.setattr("src.clients.base.time.monotonic", lambda: 100.0)
+        client = ApiBClient(
+            base_url="https://api-b.example.com", api_key="test-key", rate_limit_requests=3
+        )
+        
+        for _ in range(3):
+            client._wait_for_rate_limit()
+        
+        assert sleeps == []
+        assert client._rate_bucket.tokens == 0
+    
+    def test_waits_for_next_token_when_empty(self, api_b_client, monkeypatch):
+        """Test an empty bucket sleeps for one refill interval."""
+        sleeps = []
+        monkeypatch.setattr("src.clients.base.time.sleep", sleeps.append)
+        monkeypatch.setattr("src.clients.base.time.monotonic", lambda: 100.0)
+        bucket = api_b_client._rate_bucket
+        bucket.tokens = 0.0
+        bucket.last_refill = 100.0
+        
+        api_b_client._wait_for_rate_limit()
+        
+        interval = api_b_client.rate_limit_period / api_b_client.rate_limit_requests
+        assert sleeps == [pytest.approx(interval)]
+    
+    def test_clients_of_same_api_share_bucket(self, api_b_client):
+        """Test a second client for the same API counts against the same limit."""
+        other = ApiBClient(base_url="https://api-b.example.com", api_key="other-key")
+        
+        api_b_client._wait_for_rate_limit()
+        other._wait_for_rate_limit()
+        
+        assert other._rate_bucket is api_b_client._rate_bucket
+        assert api_b_client._rate_bucket.tokens == pytest.approx(
+            api_b_client.rate_limit_requests - 2, abs=0.01
+        )
+    
+    def test_bucket_shared_per_host(self, api_b_client):
+        """Test base paths on the same host share one bucket; other hosts don't."""
+        same_host = ApiBClient(base_url="https://api-b.example.com/v2", api_key="test-key")
+        other_host = ApiBClient(base_url="https://api-c.example.com", api_key="test-key")
+        
+        assert same_host._rate_bucket is api_b_client._rate_bucket
+        assert other_host._rate_bucket is not api_b_client._rate_bucket
+
+
+class TestRequestMetrics:
+    """Tests for request metrics."""
+    
+    def test_average_from_running_totals(self):
+        """Test average uses totals, not stored durations."""
+        metrics = RequestMetrics()
+        for duration in (10.0, 20.0, 30.0):
+            metrics.record_request(duration, success=True)
+        
+        assert metrics.avg_duration_ms == 20.0
+        assert metrics.to_dict()["successful_requests"] == 3
+    
+    def test_recent_durations_are_bounded(self):
+        """Test memory stays constant for long extracts."""
+        metrics = RequestMetrics()
+        for _ in range(RECENT_DURATIONS_SIZE + 500):
+            metrics.record_request(5.0, success=True)
+        
+        assert len(metrics.recent_durations) == RECENT_DURATIONS_SIZE
+        assert metrics.total_requests == RECENT_DURATIONS_SIZE + 500
+    
+    def test_empty_metrics(self):
+        """Test metrics with no requests."""
+        metrics = RequestMetrics()
+        
+        assert metrics.avg_duration_ms == 0
+        assert metrics.p95_duration_ms == 0
+
+
+class TestResponseDecoding:
+    """Tests for JSON response decoding."""
+    
+    def test_get_decodes_response_body(self, api_b_client, monkeypatch):
+        """Test get() decodes the raw body into a dict."""
+        class FakeResponse:
+            content = b'{"items": [{"id": "1", "name": "caf\\u00e9"}], "total": 1}'
+        
+        monkeypatch.setattr(
+            api_b_client, "_make_request", lambda *args, **kwargs: FakeResponse()
+        )
+        
+        assert api_b_client.get("data") == {"items": [{"id": "1", "name": "café"}], "total": 1}
+    
+    def test_get_serves_cached_response_within_ttl(self, monkeypatch):
+        """Test identical GETs within the TTL make one request."""
+        client = ApiBClient(base_url="https://api-b.example.com", api_key="test-key")
+        client.cache_ttl_seconds = 60
+        calls = []
+        
+        def make_request(method, endpoint, params=None, headers=None):
+            calls.append(params)
+            return make_response({"items": [], "total": 0})
+        
+        monkeypatch.setattr(client, "_make_request", make_request)
+        
+        first = client.get("data", params={"offset": 0})
+        second = client.get("data", params={"offset": 0})
+        client.get("data", params={"offset": 2})
+        
+        assert first is second
+        assert calls == [{"offset": 0}, {"offset": 2}]
+    
+    def test_post_encodes_json_body(self, api_b_client, monkeypatch):
+        """Test post() sends pre-encoded JSON bytes with a JSON content type."""
+        sent = {}
+        
+        def request(**kwargs):
+            sent.update(kwargs)
+            return make_response({"ok": True})
+        
+        monkeypatch.setattr(api_b_client.session, "request", request)
+        
+        assert api_b_client.post("data", json_data={"name": "café"}) == {"ok": True}
+        assert json.loads(sent["data"]) == {"name": "café"}
+        assert sent["headers"]["Content-Type"] == "application/json"
+
+
+class TestRetryConfig:
+    """Tests for the urllib3 retry configuration."""
+    
+    def test_429_retried_by_urllib3(self, api_b_client):
+        """Test 429s are retried at the adapter layer honoring Retry-After."""
+        retry = api_b_client.session.get_adapter("https://").max_retries
+        
+        assert 429 in retry.status_forcelist
+        assert retry.respect_retry_after_header
+    
+    def test_retry_after_date_form_supported(self, api_b_client):
+        """Test HTTP-date Retry-After values parse (RFC 7231)."""
+        retry = api_b_client.session.get_adapter("https://").max_retries
+        
+        assert retry.parse_retry_after("Wed, 21 Oct 2015 07:28:00 GMT") == 0
+    
+    def test_backoff_is_jittered(self, api_b_client):
+        """Test retry backoff adds random jitter."""
+        retry = api_b_client.session.get_adapter("https://").max_retries
+        
+        assert retry.backoff_jitter > 0
+
+
+class TestConnectionPool:
+    """Tests for the session's connection pool."""
+    
+    def test_pool_sized_to_concurrency(self, api_b_client):
+        """Test iter_many() workers each get a pooled connection."""
+        adapter = api_b_client.session.get_adapter("https://")
+        
+        assert adapter._pool_maxsize == api_b_client.max_concurrency
+    
+    def test_sockets_use_tcp_keepalive(self, api_b_client):
+        """Test pooled connections enable SO_KEEPALIVE."""
+        adapter = api_b_client.session.get_adapter("https://")
+        options = adapter.poolmanager.connection_pool_kw["socket_options"]
+        
+        assert (socket.SOL_SOCKET, socket.SO_KEEPALIVE, 1) in options
+    
+    def test_clients_share_adapter(self, api_a_client, api_b_client):
+        """Test clients with the same settings reuse one connection pool."""
+        assert (
+            api_a_client.session.get_adapter("https://")
+            is api_b_client.session.get_adapter("https://")
+        )
+    
+    def test_context_manager_keeps_shared_pool_open(self, api_a_client, api_b_client):
+        """Test closing one client leaves the shared pool to the others."""
+        adapter = api_b_client.session.get_adapter("https://")
+        
+        with api_a_client as client:
+            assert client is api_a_client
+        
+        assert api_a_client.session.adapters == {}
+        assert api_b_client.session.get_adapter("https://") is adapter
+        assert api_a_client.oauth_client._closed
+
+
+class TestBuildUrl:
+    """Tests for endpoint URL resolution."""
+    
+    def test_relative_endpoint_joined_and_cached(self, api_b_client):
+        """Test endpoints are joined to base_url once and reused."""
+        assert api_b_client._build_url("/data") == "https://api-b.example.com/data"
+        assert api_b_client._build_url("/data") is api_b_client._build_url("/data")
+    
+    def test_absolute_url_passed_through(self, api_b_client):
+        """Test absolute URLs are not joined or cached."""
+        url = "https://other.example.com/page?token=x"
+        
+        assert api_b_client._build_url(url) == url
+        assert url not in api_b_client._url_cache
@@ -1,16 +1,24 @@
 """Tests for transformation modules."""
 
 import pytest
-from src.transform.flatten import flatten_json, flatten_records
+from src.transform import normalize
+from src.transform.flatten import flatten_json, flatten_records, flatten_records_specialized
 from src.transform.normalize import (
     normalize_timestamp,
     normalize_key,
     normalize_record,
     validate_required_fields,
     validate_records,
+    validate_records_soa,
     dedupe_records,
+    dedupe_records_iter,
     dedupe_by_id_updated,
     transform_records,
+    transform_records_soa,
+    transform_records_parallel,
+    transform_record_stream,
+    make_transformer,
+    transform_table,
     ValidationError,
 )
 
@@ -57,6 +65,13 @@ class TestFlattenJson:
         
         assert "a_b_c" in result
         assert isinstance(result["a_b_c"], dict)
+    
+    def test_flatten_preserves_key_order(self):
+        """Test nested keys stay in document order."""
+        nested = {"a": 1, "b": {"c": {"d": 2}, "e": 3}, "f": 4}
+        result = flatten_json(nested)
+        
+        assert list(result) == ["a", "b_c_d", "b_e", "f"]
 
 
 class TestFlattenRecords:
@@ -68,6 +83,30 @@ class TestFlattenRecords:
         
         assert len(result) == 3
         assert all("id" in r for r in result)
+    
+    def test_flatten_specialized_matches_generic(self):
+        """Test the shape-specialized flattener, including shape changes."""
+        records = [
+            {"id": 1, "user": {"name": "a", "profile": {"age": 30}}, "tag": "x", "meta": {"v": 1}},
+            {"id": 2, "user": {"name": "b", "profile": {"age": 31}}, "tag": "y", "meta": {"v": 2}},
+            {"id": 3, "user": {"name": "c"}, "tag": "z", "meta": {"v": 3}},  # missing nested key
+            {"id": 4, "user": {"name": "d", "profile": 5}, "tag": "z", "meta": {"v": 4}},  # dict became scalar
+            {"id": {"inner": 5}, "user": {"name": "e", "profile": {"age": 1}}, "tag": "z", "meta": {}},  # scalar became dict
+            {"tag": "w", "id": 6, "user": {"name": "f", "profile": {"age": 2}}, "meta": {"v": 6}},  # reordered keys
+        ]
+        
+        for max_depth in (10, 1):
+            expected = flatten_records(records, max_depth=max_depth)
+            result = flatten_records_specialized(records, max_depth=max_depth)
+            # Compare items, not dicts, so key (column) order is checked too
+            assert [list(r.items()) for r in result] == [list(r.items()) for r in expected]
+    
+    def test_flatten_specialized_key_collision(self):
+        """Test colliding flattened keys resolve as in flatten_json."""
+        for record in ({"a": {"b": 1}, "a_b": 2}, {"a_b": 2, "a": {"b": 1}}):
+            result = flatten_records_specialized([record, dict(record)])
+            
+            assert list(result[1].items()) == list(flatten_json(record).items())
 
 
 class TestNormalizeTimestamp:
@@ -89,6 +128,11 @@ class TestNormalizeTimestamp:
         result = normalize_timestamp(1705315800000)
         assert result is not None
     
+    def test_normalize_unix_out_of_range(self):
+        """Test out-of-range numeric timestamps return None."""
+        assert normalize_timestamp(1e20) is None
+        assert normalize_timestamp(float("nan")) is None
+    
     def test_normalize_none(self):
         """Test None value."""
         result = normalize_timestamp(None)
@@ -98,6 +142,17 @@ class TestNormalizeTimestamp:
         """Test invalid string returns None."""
         result = normalize_timestamp("not a timestamp")
         assert result is None
+    
+    def test_normalize_iso_variants(self):
+        """Test space separator, offsets and date-only ISO strings."""
+        assert normalize_timestamp("2024-01-15 10:30:00.5") == "2024-01-15T10:30:00.500000Z"
+        assert normalize_timestamp("2024-01-15T10:30:00+00:00") == "2024-01-15T10:30:00.000000Z"
+        assert normalize_timestamp("2024-01-15") == "2024-01-15T00:00:00.000000Z"
+    
+    def test_day_first_kept_after_month_first_match(self):
+        """Test a month-first match does not reorder ambiguous dates."""
+        assert normalize_timestamp("12/31/2024 10:00:00").startswith("2024-12-31")
+        assert normalize_timestamp("05/04/2024 10:00:00").startswith("2024-04-05")
 
 
 class TestNormalizeKey:
@@ -116,6 +171,12 @@ class TestNormalizeKey:
         """Test space and hyphen handling."""
         assert normalize_key("key-name") == "key_name"
         assert normalize_key("key name") == "key_name"
+    
+    def test_acronyms_and_digits(self):
+        """Test acronym and digit word boundaries."""
+        assert normalize_key("HTTPResponse") == "http_response"
+        assert normalize_key("userID") == "user_id"
+        assert normalize_key("getHTTP2Code") == "get_http2_code"
 
 
 class TestNormalizeRecord:
@@ -178,6 +239,24 @@ class TestValidation:
         assert result.is_valid is False
         assert "Empty value for required field: name" in result.errors
     
+    def test_validate_required_fields_fail_fast(self):
+        """Test fail_fast stops at the first failing field."""
+        record = {"name": None}
+        result = validate_required_fields(record, ["id", "name"], fail_fast=True)
+        
+        assert result.is_valid is False
+        assert result.errors == ["Missing required field: id"]
+    
+    def test_validate_records_soa(self):
+        """Test columnar validation mask."""
+        columns = {
+            "id": ["1", "2", "3", None],
+            "name": ["Valid", "  ", "Also Valid", "Orphan"],
+        }
+        
+        assert validate_records_soa(columns, ["id", "name"]) == [True, False, True, False]
+        assert validate_records_soa(columns, ["missing"]) == [False] * 4
+    
     def test_validate_records_batch(self):
         """Test batch validation."""
         records = [
@@ -189,7 +268,7 @@ class TestValidation:
         
         assert len(valid) == 2
         assert len(invalid) == 1
-        assert invalid[0]["id"] == "2"
+        assert invalid[0]["record"]["id"] == "2"
     
     def test_validate_records_raise_on_error(self):
         """Test validation raises exception when requested."""
@@ -204,6 +283,18 @@ class TestValidation:
 class TestDeduplication:
     """Tests for record deduplication."""
     
+    def test_dedupe_iter_streams_first_seen(self):
+        """Test the iterator variant yields survivors lazily."""
+        records = iter([
+            {"id": "1", "value": "first"},
+            {"id": "2", "value": "unique"},
+            {"id": "1", "value": "second"},
+        ])
+        deduped = dedupe_records_iter(records, key_fields=["id"])
+        
+        assert next(deduped)["value"] == "first"
+        assert [r["value"] for r in deduped] == ["unique"]
+    
     def test_dedupe_by_single_key(self):
         """Test deduplication by single key field."""
         records = [
@@ -247,6 +338,17 @@ class TestDeduplication:
         assert len(result) == 1
         assert result[0]["value"] == "old"
     
+    def test_dedupe_keep_last_unsorted_input(self):
+        """Test the newest record wins wherever it appears in the batch."""
+        records = [
+            {"id": "1", "updated_at": "2025-01-02", "value": "new"},
+            {"id": "2", "updated_at": "2025-01-01", "value": "only"},
+            {"id": "1", "updated_at": "2025-01-01", "value": "old"},
+        ]
+        result = dedupe_records(records, key_fields=["id"], sort_field="updated_at")
+        
+        assert [r["value"] for r in result] == ["new", "only"]
+    
     def test_dedupe_composite_key(self):
         """Test deduplication with composite key."""
         records = [
@@ -316,6 +418,41 @@ class TestTransformPipeline:
         # Keys should be normalized
         assert all("created_at" in r for r in valid)
     
+    def test_transform_records_soa(self):
+        """Test columnar output matches the record pipeline."""
+        records = [
+            {"id": "1", "name": "First", "extra": 1},
+            {"id": "2", "name": None},  # Invalid
+            {"id": "3", "name": "Third"},
+        ]
+        
+        columns, invalid = transform_records_soa(records, required_fields=["id", "name"])
+        
+        assert columns == {
+            "id": ["1", "3"],
+            "name": ["First", "Third"],
+            "extra": [1, None],
+        }
+        assert len(invalid) == 1
+    
+    def test_transform_records_parallel_matches_serial(self, monkeypatch):
+        """Test the multi-process pipeline gives the serial result."""
+        monkeypatch.setattr(normalize, "PARALLEL_MIN_RECORDS", 0)
+        records = [
+            {"id": str(i % 7), "name": None if i % 5 == 0 else "x", "updatedAt": f"2025-01-{i % 28 + 1:02d}"}
+            for i in range(100)
+        ]
+        kwargs = {
+            "required_fields": ["id", "name"],
+            "timestamp_fields": ["updated_at"],
+            "dedupe_key_fields": ["id"],
+            "dedupe_sort_field": "updated_at",
+        }
+        
+        parallel = transform_records_parallel(records, n_workers=2, chunksize=30, **kwargs)
+        
+        assert parallel == transform_records(records, **kwargs)
+    
     def test_transform_records_with_invalid(self):
         """Test pipeline with some invalid records."""
         records = [
@@ -331,3 +468,90 @@ class TestTransformPipeline:
         
         assert len(valid) == 2
         assert len(invalid) == 1
+    
+    def test_transform_record_stream_consumes_iterator(self):
+        """Test the single-pass transform matches the batch pipeline on a generator."""
+        records = [
+            {"id": "1", "name": "First", "updatedAt": "2025-01-01T00:00:00Z"},
+            {"id": "2", "name": None, "updatedAt": "2025-01-02T00:00:00Z"},
+            {"id": "1", "name": "Newest", "updatedAt": "2025-01-03T00:00:00Z"},
+            {"id": "1", "name": "Older", "updatedAt": "2025-01-02T00:00:00Z"},
+            {"id": "3", "name": "Third", "updatedAt": "2025-01-01T00:00:00Z"},
+        ]
+        
+        result = transform_record_stream(
+            (r for r in records),
+            required_fields=["id", "name"],
+            timestamp_fields=["updated_at"],
+            dedupe_key_fields=["id"],
+            dedupe_sort_field="updated_at",
+        )
+        
+        assert result.input_count == 5
+        assert [r["name"] for r in result.valid_records] == ["Newest", "Third"]
+        assert [r["record"]["id"] for r in result.invalid_records] == ["2"]
+        assert result.invalid_records[0]["_record_index"] == 1
+    
+    def test_make_transformer_is_cached_per_config(self):
+        """Test transformers are reused and keep working across batches."""
+        transform = make_transformer(
+            required_fields=("id",),
+            timestamp_fields=("updated_at",),
+            dedupe_key_fields=("id",),
+            dedupe_sort_field="updated_at",
+        )
+        
+        assert make_transformer(
+            required_fields=("id",),
+            timestamp_fields=("updated_at",),
+            dedupe_key_fields=("id",),
+            dedupe_sort_field="updated_at",
+        ) is transform
+        
+        for _ in range(2):
+            result = transform(iter([
+                {"id": "1", "updatedAt": "2025-01-01T00:00:00Z", "meta": {"tagName": " a "}},
+                {"id": "1", "updatedAt": "2025-01-02T00:00:00Z", "meta": {"tagName": " b "}},
+            ]))
+            assert result.valid_records == [{
+                "id": "1",
+                "updated_at": "2025-01-02T00:00:00.000000Z",
+                "meta": {"tag_name": "b"},
+            }]
+    
+    def test_transform_table_matches_record_pipeline(self):
+        """Test the columnar transform keeps the newest valid row per key."""
+        pa = pytest.importorskip("pyarrow")
+        table = pa.Table.from_pylist([
+            {"id": "1", "name": " First ", "updatedAt": "2025-01-01T00:00:00Z"},
+            {"id": "2", "name": None, "updatedAt": "2025-01-02T00:00:00Z"},
+            {"id": "1", "name": "Newest", "updatedAt": "2025-01-03T00:00:00Z"},
+            {"id": "3", "name": " Third ", "updatedAt": "2025-01-01T00:00:00Z"},
+        ])
+        
+        valid, invalid = transform_table(
+            table,
+            required_fields=["id", "name"],
+            timestamp_fields=["updated_at"],
+            dedupe_key_fields=["id"],
+            dedupe_sort_field="updated_at",
+        )
+        
+        assert valid.to_pylist() == [
+            {"id": "1", "name": "Newest", "updated_at": "2025-01-03T00:00:00.000000Z"},
+            {"id": "3", "name": "Third", "updated_at": "2025-01-01T00:00:00.000000Z"},
+        ]
+        assert invalid["id"].to_pylist() == ["2"]
+    
+    def test_transform_table_empty(self):
+        """Test empty tables (with or without columns) yield empty results."""
+        pa = pytest.importorskip("pyarrow")
+        empty = pa.table({"id": pa.array([], type=pa.string())})
+        
+        for table in (empty, pa.table({})):
+            valid, invalid = transform_table(
+                table,
+                required_fields=["id"],
+                dedupe_key_fields=["id"],
+            )
+            assert valid.num_rows == invalid.num_rows == 0